@@ -8,11 +8,28 @@ from plotly.subplots import make_subplots
 import os
 import json
 import time
+import threading
 import base64
 from datetime import date
-from github import Github, UnknownObjectException
-
-from fund_monitor.core import get_strategy_advice
+from github import Github, GithubException, UnknownObjectException
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba 不可用时退化为普通 Python 函数，回测结果保持一致
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
+try:
+    import orjson
+except ImportError:
+    # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+from fund_monitor.core import get_strategy_advice_batch
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -22,8 +39,11 @@ st.set_page_config(
 )
 
 # --- Constants and File Paths ---
-TRANSACTIONS_FILE = 'my_transactions.csv'
+TRANSACTIONS_FILE = 'my_transactions.parquet'
+LEGACY_TRANSACTIONS_FILE = 'my_transactions.csv'  # 旧版 CSV 记录，仅在 Parquet 文件不存在时读取
 STRATEGIES_FILE = 'fund_strategies.json'
+TRANSACTION_COLUMNS = ['date', 'fund_code', 'type', 'price', 'shares', 'value', 'reason']
+DATA_CACHE_DIR = '.akshare_cache'  # akshare 接口返回数据的本地 Parquet 缓存，进程重启后仍可复用
 
 # --- GitHub Integration Functions ---
 @st.cache_resource
@@ -45,10 +65,17 @@ def get_github_repo():
         st.error(f"无法连接到 GitHub 仓库，请检查 Streamlit Secrets 配置: {e}")
         return None
 
+def _remember_file_sha(file_path, sha):
+    """Caches the latest known blob SHA of a repo file for this session."""
+    if 'github_file_shas' not in st.session_state:
+        st.session_state['github_file_shas'] = {}
+    st.session_state['github_file_shas'][file_path] = sha
+
 def get_json_from_repo(repo, file_path):
     """Fetches and decodes a JSON file from the GitHub repo."""
     try:
         content_obj = repo.get_contents(file_path)
+        _remember_file_sha(file_path, content_obj.sha)
         decoded_content = base64.b64decode(content_obj.content).decode('utf-8')
         return json.loads(decoded_content)
     except UnknownObjectException:
@@ -61,16 +88,30 @@ def save_json_to_repo(repo, file_path, data, commit_message):
     """Commits and pushes a JSON file to the GitHub repo."""
     try:
         json_content = json.dumps(data, indent=2, ensure_ascii=False)
-        
+
+        # With a SHA cached from the last read/write, a single PUT is enough.
+        # A stale or missing SHA (409/404/422) falls back to fetching the current one.
+        cached_sha = st.session_state.get('github_file_shas', {}).get(file_path)
+        if cached_sha:
+            try:
+                result = repo.update_file(file_path, commit_message, json_content, cached_sha)
+                _remember_file_sha(file_path, result['content'].sha)
+                st.success(f"策略文件已成功同步到 GitHub！")
+                return True
+            except GithubException as e:
+                if e.status not in (404, 409, 422):
+                    raise
+
         try:
             # Check if file exists to get its SHA for update
             file_obj = repo.get_contents(file_path)
-            repo.update_file(file_path, commit_message, json_content, file_obj.sha)
+            result = repo.update_file(file_path, commit_message, json_content, file_obj.sha)
             st.success(f"策略文件已成功同步到 GitHub！")
         except UnknownObjectException:
             # File doesn't exist, create it
-            repo.create_file(file_path, commit_message, json_content)
+            result = repo.create_file(file_path, commit_message, json_content)
             st.success(f"策略文件已成功创建并同步到 GitHub！")
+        _remember_file_sha(file_path, result['content'].sha)
         return True
     except Exception as e:
         st.error(f"同步策略文件到 GitHub 失败: {e}")
@@ -81,6 +122,9 @@ def load_strategies_from_local(file_path):
     if not os.path.exists(file_path):
         return {}
     try:
+        if orjson is not None:
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception as e:
@@ -90,8 +134,12 @@ def load_strategies_from_local(file_path):
 def save_strategies_to_local(file_path, data):
     """Saves strategies to a local JSON file."""
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         st.success("策略已成功保存到本地文件！")
         return True
     except Exception as e:
@@ -99,29 +147,43 @@ def save_strategies_to_local(file_path, data):
         return False
 
 def load_transactions_from_file():
-    """从 CSV 文件加载个人交易记录"""
-    if not os.path.exists(TRANSACTIONS_FILE):
-        return pd.DataFrame(columns=['date', 'fund_code', 'type', 'price', 'shares', 'value', 'reason'])
+    """从 Parquet 文件加载个人交易记录 (兼容旧版 CSV 文件)"""
     try:
-        # Ensure fund_code is read as a string to prevent type mismatches
-        df = pd.read_csv(TRANSACTIONS_FILE, dtype={'fund_code': str})
-        df['date'] = pd.to_datetime(df['date'])
-        return df
+        if os.path.exists(TRANSACTIONS_FILE):
+            # Parquet 自带列类型，fund_code 与 date 无需再转换
+            return pd.read_parquet(TRANSACTIONS_FILE)
+        if not os.path.exists(LEGACY_TRANSACTIONS_FILE):
+            return pd.DataFrame(columns=TRANSACTION_COLUMNS)
+        # 完整指定各列类型并在读取时解析日期，跳过类型推断与二次转换 (fund_code 必须按字符串读取)
+        return pd.read_csv(LEGACY_TRANSACTIONS_FILE, dtype={
+            'fund_code': str, 'type': 'category', 'price': np.float64,
+            'shares': np.float64, 'value': np.float64, 'reason': str,
+        }, parse_dates=['date'], engine='c')
     except Exception as e:
         st.error(f"从文件加载交易记录失败: {e}")
-        return pd.DataFrame(columns=['date', 'fund_code', 'type', 'price', 'shares', 'value', 'reason'])
+        return pd.DataFrame(columns=TRANSACTION_COLUMNS)
 
 def save_transactions_to_file(df):
-    """将个人交易记录保存到 CSV 文件"""
+    """将个人交易记录保存到 Parquet 文件"""
     try:
-
-        df.to_csv(TRANSACTIONS_FILE, index=False)
+        # 先写临时文件再原子替换，避免写到一半中断时损坏已有记录
+        tmp_file = TRANSACTIONS_FILE + '.tmp'
+        df.to_parquet(tmp_file, index=False, compression='zstd')
+        os.replace(tmp_file, TRANSACTIONS_FILE)
     except Exception as e:
         st.error(f"保存交易记录到文件失败: {e}")
 
+def transactions_to_frame(rows):
+    """将交易记录行列表一次性构造成 DataFrame，低基数的类型与基金代码列存为 Categorical"""
+    df = pd.DataFrame(rows, columns=TRANSACTION_COLUMNS)
+    df['type'] = pd.Categorical(df['type'], categories=TX_TYPE_LABELS)
+    df['fund_code'] = df['fund_code'].astype('category')
+    return df
+
 # 在应用启动时，从文件加载交易记录到 Session State
-if 'transactions' not in st.session_state:
-    st.session_state.transactions = load_transactions_from_file()
+# 以行字典列表保存，新增交易只需 append，避免每次 pd.concat 复制整张表
+if 'transaction_rows' not in st.session_state:
+    st.session_state.transaction_rows = load_transactions_from_file().to_dict('records')
 
 # Strategies are loaded based on environment (cloud vs. local)
 if 'strategies' not in st.session_state:
@@ -134,37 +196,108 @@ if 'strategies' not in st.session_state:
         st.session_state.strategies = load_strategies_from_local(STRATEGIES_FILE)
 
 # --- Helper Functions ---
+@njit(cache=True)
+def _expand_calendar(src_ordinals, src_nav, out_ordinals):
+    """将按日期升序的净值序列对齐到交易日历 (均为 int64 纳秒序数)
+
+    日历上有净值的日期直接取值，缺失日期沿用上一个净值；开头缺失的部分用第一个有效净值回填。
+    不在日历上的源数据日期会被忽略，与 reindex + ffill + bfill 的结果一致。
+    """
+    n_src = src_ordinals.shape[0]
+    n_out = out_ordinals.shape[0]
+    nav_out = np.empty(n_out, dtype=np.float64)
+    last = np.nan
+    first_valid = -1
+    i = 0
+    for j in range(n_out):
+        t = out_ordinals[j]
+        while i < n_src and src_ordinals[i] < t:
+            i += 1
+        if i < n_src and src_ordinals[i] == t and not np.isnan(src_nav[i]):
+            last = src_nav[i]
+            if first_valid < 0:
+                first_valid = j
+        nav_out[j] = last
+    if first_valid > 0:
+        nav_out[:first_valid] = nav_out[first_valid]
+    return nav_out
+
+def load_or_fetch_parquet(file_name, fetch, max_age):
+    """读取本地 Parquet 缓存，文件超过 max_age 秒时调用 fetch 重新获取并写回；获取失败时退回旧缓存"""
+    path = os.path.join(DATA_CACHE_DIR, file_name)
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < max_age:
+        return pd.read_parquet(path)
+    try:
+        df = fetch()
+    except Exception:
+        if os.path.exists(path):
+            return pd.read_parquet(path)
+        raise
+    try:
+        os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        pass  # 缓存写入失败 (如只读文件系统) 不影响本次返回的数据
+    return df
+
+def _download_trade_dates():
+    """从 akshare 下载全部历史交易日"""
+    trade_cal_df = ak.tool_trade_date_hist_sina()
+    trade_cal_df['trade_date'] = pd.to_datetime(trade_cal_df['trade_date'])
+    return trade_cal_df
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def fetch_trade_dates() -> pd.DatetimeIndex:
+    """全部历史交易日 (已排序)，一天内所有基金、所有日期范围共用一份"""
+    trade_cal_df = load_or_fetch_parquet('trade_cal.parquet', _download_trade_dates, max_age=86400)
+    return pd.DatetimeIndex(trade_cal_df['trade_date']).sort_values()
+
 @st.cache_data
 def get_trade_cal(start_date, end_date):
     """获取指定范围内的所有A股交易日。"""
     try:
-        trade_cal_df = ak.tool_trade_date_hist_sina()
-        trade_cal_df['trade_date'] = pd.to_datetime(trade_cal_df['trade_date'])
-        
-        start_dt = pd.to_datetime(start_date)
-        end_dt = pd.to_datetime(end_date)
-        
-        trade_cal = trade_cal_df[
-            (trade_cal_df['trade_date'] >= start_dt) & 
-            (trade_cal_df['trade_date'] <= end_dt)
-        ]['trade_date']
-        
-        return pd.DatetimeIndex(trade_cal)
+        trade_dates = fetch_trade_dates()
+        # 交易日已排序，二分查找首尾位置切片即可
+        lo = trade_dates.searchsorted(pd.Timestamp(start_date), side='left')
+        hi = trade_dates.searchsorted(pd.Timestamp(end_date), side='right')
+        return trade_dates[lo:hi]
     except Exception as e:
         st.warning(f"获取交易日历失败: {e}. 将回退到使用周一至周五作为交易日。")
         return pd.bdate_range(start=start_date, end=end_date)
 
-@st.cache_data
+def _download_raw_nav(fund_code):
+    """从 akshare 下载并解析基金全部历史单位净值"""
+    fund_data_raw = ak.fund_open_fund_info_em(fund_code, indicator="单位净值走势")
+    if fund_data_raw.empty: return fund_data_raw
+    # 固定格式 + cache 跳过 dateutil 的格式推断，重复日期只解析一次
+    fund_data_raw['净值日期'] = pd.to_datetime(fund_data_raw['净值日期'], format='%Y-%m-%d', cache=True)
+    # 净值保持 float64：实时建议与回测的阈值判断都依赖精确的收益率
+    fund_data_raw['单位净值'] = pd.to_numeric(fund_data_raw['单位净值'], errors='raise').astype(np.float64)
+    if fund_data_raw['单位净值'].max() >= 1e4:
+        raise ValueError(f"基金 {fund_code} 的单位净值数据异常 (最大值 {fund_data_raw['单位净值'].max()})")
+    return fund_data_raw.sort_values('净值日期', ignore_index=True)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_raw_nav(fund_code: str) -> pd.DataFrame:
+    """获取基金全部历史单位净值 (已解析日期与净值, 按日期升序), 供回测、建议与持仓分析共用"""
+    # 本地缓存与内存缓存同样一小时过期，冷启动时无需重新请求接口
+    # 文件名带 f64：旧版缓存中的单位净值为 float32，换名后不会再被读取
+    return load_or_fetch_parquet(f'nav_f64_{fund_code}.parquet', lambda: _download_raw_nav(fund_code), max_age=3600)
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner="加载基金历史数据...")
 def get_fund_data(fund_code, start_date, end_date):
-    """获取基金历史净值数据, 并严格对齐交易日"""
+    """获取基金历史净值数据, 并严格对齐交易日
+
+    与 fetch_raw_nav 使用相同的一小时有效期，避免原始净值更新后仍返回旧的对齐结果。
+    """
     try:
         # 1. 获取基金原始数据
-        fund_data_raw = ak.fund_open_fund_info_em(fund_code, indicator="单位净值走势")
+        fund_data_raw = fetch_raw_nav(fund_code)
         if fund_data_raw.empty: return None
         
-        fund_data_raw['净值日期'] = pd.to_datetime(fund_data_raw['净值日期'])
-        fund_data = fund_data_raw.set_index('净值日期').sort_index()
-        fund_data['单位净值'] = pd.to_numeric(fund_data['单位净值'])
+        fund_data = fund_data_raw.set_index('净值日期')
 
         # 2. 获取标准交易日历
         cal_start = fund_data.index.min() if not fund_data.empty else start_date
@@ -172,19 +305,27 @@ def get_fund_data(fund_code, start_date, end_date):
         trade_cal = get_trade_cal(cal_start, cal_end)
         
         # 3. 与交易日历进行重采样对齐
-        fund_data = fund_data.reindex(trade_cal)
-        
         # 4. 填充因基金暂停交易等原因在交易日产生的NaN值
-        fund_data['单位净值'] = fund_data['单位净值'].ffill().bfill()
+        #    两者均按日期升序，双指针一次扫描完成对齐与前后填充
+        src_ordinals = fund_data.index.as_unit('ns').asi8
+        src_nav = fund_data['单位净值'].to_numpy(dtype=np.float64)
+        cal_ordinals = trade_cal.as_unit('ns').asi8
+        if np.array_equal(src_ordinals, cal_ordinals) and not np.isnan(src_nav).any():
+            # 常见情况：基金每个交易日都有净值，无需对齐与填充
+            nav_aligned = src_nav
+        else:
+            nav_aligned = _expand_calendar(src_ordinals, src_nav, cal_ordinals)
+        fund_data = pd.DataFrame({'单位净值': nav_aligned}, index=trade_cal)
         
         # 5. 筛选回用户指定的日期范围
-        fund_data = fund_data[(fund_data.index >= pd.to_datetime(start_date)) & (fund_data.index <= pd.to_datetime(end_date))]
+        #    索引已按日期升序排列，直接二分查找首尾位置切片
+        lo = fund_data.index.searchsorted(np.datetime64(start_date), side='left')
+        hi = fund_data.index.searchsorted(np.datetime64(end_date), side='right')
+        fund_data = fund_data.iloc[lo:hi]
 
         if fund_data.empty: return None
 
-        # 6. 为了兼容后续代码，添加 is_trading_day 和 last_trading_date
-        fund_data['is_trading_day'] = True
-        fund_data['last_trading_date'] = fund_data.index.to_series()
+        # 每一行都是交易日，回测直接以行号平移回顾期，无需额外的交易日标记列
         fund_data.index.name = '净值日期'
         
         return fund_data
@@ -193,22 +334,268 @@ def get_fund_data(fund_code, start_date, end_date):
         st.error(f"获取基金数据时出错: {e}")
         return None
 
-@st.cache_data
+def _download_fund_names():
+    """从 akshare 下载全市场基金列表，只保留代码和简称两列"""
+    fund_list = ak.fund_name_em()[['基金代码', '基金简称']].drop_duplicates('基金代码')
+    fund_list['基金代码'] = fund_list['基金代码'].astype(str)
+    return fund_list
+
+@st.cache_resource(ttl=86400, show_spinner=False)
+def fetch_fund_names() -> dict:
+    """获取全市场基金代码到简称的映射 (dict)，列表一天内基本不变，所有基金共用一份并缓存到磁盘
+
+    映射只读，用 cache_resource 直接共享同一个对象，避免 cache_data 每次调用都反序列化约两万条记录。
+    """
+    fund_list = load_or_fetch_parquet('fund_names.parquet', _download_fund_names, max_age=86400)
+    return dict(zip(fund_list['基金代码'], fund_list['基金简称']))
+
+@st.cache_data(ttl=86400, show_spinner=False)
 def get_fund_name(fund_code):
-    """获取基金名称"""
+    """获取基金名称，按基金代码只缓存一个短字符串，每次重跑取名称不必访问整张映射"""
     try:
-        fund_list = ak.fund_name_em()
-        return fund_list[fund_list['基金代码'] == fund_code]['基金简称'].iloc[0]
+        return fetch_fund_names().get(str(fund_code), "未知名称")
     except Exception:
         return "未知名称"
 
+# 估值约每分钟才更新一次，60 秒内重复刷新直接复用成功的建议
+ADVICE_CACHE_TTL = 60
+
+@st.cache_resource
+def _advice_cache() -> tuple:
+    """实时建议的进程级缓存 {(基金代码, 策略参数): (获取时刻, 结果)} 及其锁，只保存成功的结果
+
+    各会话的脚本线程共用同一个 dict，读写都要持锁；锁与 dict 一起缓存，脚本每次重跑拿到的是同一把锁。
+    """
+    return {}, threading.Lock()
+
+def fetch_strategy_advice_batch(strategies: dict) -> list:
+    """批量获取实时操作建议，结果顺序与 strategies 一致
+
+    缓存查找在脚本线程完成，只有未命中的基金交给 get_strategy_advice_batch 并发请求；
+    失败的结果不缓存，下次刷新会重新获取。
+    """
+    cache, lock = _advice_cache()
+    results, misses = {}, {}
+    with lock:
+        now = time.monotonic()
+        for key in [k for k, (fetched_at, _) in cache.items() if now - fetched_at >= ADVICE_CACHE_TTL]:
+            del cache[key]
+        for fund_code, params in strategies.items():
+            cached = cache.get((fund_code, tuple(sorted(params.items()))))
+            if cached is not None:
+                results[fund_code] = cached[1]
+            else:
+                misses[fund_code] = params
+
+    # 网络请求期间不持锁，其他会话仍可读取缓存
+    fetched = get_strategy_advice_batch(misses)
+    with lock:
+        for (fund_code, params), advice in zip(misses.items(), fetched):
+            if advice.get('status') == '成功':
+                cache[(fund_code, tuple(sorted(params.items())))] = (time.monotonic(), advice)
+            results[fund_code] = advice
+    return [results[fund_code] for fund_code in strategies]
+
+def lookup_nav(fund_data, dates):
+    """按日期批量取单位净值，只保留落在 fund_data 索引内的日期，返回 (日期, 净值)"""
+    dates = pd.DatetimeIndex(dates)
+    pos = fund_data.index.get_indexer(dates)
+    hit = pos >= 0
+    return dates[hit], fund_data['单位净值'].to_numpy()[pos[hit]]
+
+def downsample_lttb(x, y, n_out=2000):
+    """用 Largest-Triangle-Three-Buckets 算法将折线降采样到 n_out 个点，保留走势形状
+
+    y 保持 float64：plotly 6 之前按 JSON 序列化，float32 会被展开成 0.7810000181198120 这样的长数字，数据量反而变大。
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+    xf = x.view('i8').astype(np.float64) if np.issubdtype(x.dtype, np.datetime64) else x.astype(np.float64)
+
+    # 首尾两点固定保留，中间的点均分为 n_out - 2 个桶，每个桶选出一个点
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # 以下一个桶的均值点 (最后一个桶以末点) 作为三角形的第三个顶点
+        if b + 2 < len(edges):
+            next_lo, next_hi = edges[b + 1], edges[b + 2]
+            avg_x, avg_y = xf[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        else:
+            avg_x, avg_y = xf[-1], y[-1]
+        area = np.abs((xf[a] - avg_x) * (y[lo:hi] - y[a]) - (xf[a] - xf[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[b + 1] = a
+    return x[selected], y[selected]
+
+@njit(cache=True)
+def _max_drawdown_kernel(arr):
+    """单次遍历同时维护历史最高值与最大回撤，跳过 NaN；没有有效回撤时返回 NaN"""
+    peak = np.nan
+    min_dd = np.nan
+    for v in arr:
+        if np.isnan(v):
+            continue
+        if np.isnan(peak) or v > peak:
+            peak = v
+        # 历史最高值为 0 (尚未投入) 时回撤无意义，不参与比较
+        if peak != 0:
+            dd = (v - peak) / peak
+            if np.isnan(min_dd) or dd < min_dd:
+                min_dd = dd
+    return min_dd
+
 def calculate_max_drawdown(series):
     """计算最大回撤"""
-    if series.empty or series.isna().all(): return 0.0
-    cumulative_max = series.cummax()
-    drawdown = (series - cumulative_max) / cumulative_max
-    return drawdown.min() * 100 if pd.notna(drawdown.min()) else 0.0
+    min_dd = _max_drawdown_kernel(np.asarray(series.values, dtype=np.float64))
+    if np.isnan(min_dd): return 0.0
+    return float(min_dd) * 100
+
+TX_BUY = 0
+TX_SELL = 1
+TX_TYPE_LABELS = ['买入', '卖出']  # 按 TX_BUY / TX_SELL 编码排列
+
+def _build_reasons(tx_type, lookback_return, buy_threshold, sell_threshold):
+    """生成每笔阈值交易的触发说明"""
+    return pd.Series([
+        f"回顾期收益率 {lb:.2f}% >= 卖出阈值 {sell_threshold}%" if t == TX_SELL else f"回顾期收益率 {lb:.2f}% <= 买入阈值 {buy_threshold}%"
+        for t, lb in zip(tx_type, lookback_return)
+    ], dtype=object)
+
+# 显式签名使内核在导入时即完成编译 (配合 cache=True 从磁盘加载)，首次回测不再等待 JIT
+# 输入数组声明为只读：pandas 写时复制返回的只读视图与普通数组都能匹配
+_THRESHOLD_KERNEL_SIGNATURE = (
+    "Tuple((float64[:], int64[:], int8[:], float64[:], float64[:], float64))"
+    "(Array(float64, 1, 'A', readonly=True), Array(int64, 1, 'A', readonly=True),"
+    " Array(boolean, 1, 'A', readonly=True), Array(boolean, 1, 'A', readonly=True), float64)"
+)
 
+@njit(_THRESHOLD_KERNEL_SIGNATURE, cache=True)
+def _threshold_strategy_kernel(nav, event_idx, buy_signal, sell_signal, buy_amount):
+    """阈值策略的现金/份额状态机，只在信号日更新状态，信号日之间按持仓整段计算组合价值"""
+    n = nav.shape[0]
+    m = event_idx.shape[0]
+    portfolio_value = np.empty(n, dtype=np.float64)
+    tx_idx = np.empty(m, dtype=np.int64)
+    tx_type = np.empty(m, dtype=np.int8)
+    tx_shares = np.empty(m, dtype=np.float64)
+    tx_value = np.empty(m, dtype=np.float64)
+
+    cash = np.float64(0.0)
+    shares = np.float64(0.0)
+    total_invested = np.float64(0.0)
+    k = 0
+    prev = 0
+    for i in event_idx:
+        # 两个信号日之间持仓不变
+        portfolio_value[prev:i] = cash + shares * nav[prev:i]
+        price = nav[i]
+
+        if sell_signal[i] and shares > 0:
+            sale_value = shares * price
+            tx_idx[k] = i
+            tx_type[k] = TX_SELL
+            tx_shares[k] = shares
+            tx_value[k] = sale_value
+            k += 1
+            cash += sale_value
+            shares = np.float64(0.0)
+        elif buy_signal[i]:
+            if cash >= buy_amount:
+                cash -= buy_amount
+            else:
+                # 现金不足时从外部补充资金，计入净投入
+                total_invested += buy_amount - cash
+                cash = np.float64(0.0)
+            shares_to_buy = buy_amount / price
+            shares += shares_to_buy
+            tx_idx[k] = i
+            tx_type[k] = TX_BUY
+            tx_shares[k] = shares_to_buy
+            tx_value[k] = buy_amount
+            k += 1
+
+        portfolio_value[i] = cash + shares * price
+        prev = i + 1
+
+    portfolio_value[prev:] = cash + shares * nav[prev:]
+
+    return portfolio_value, tx_idx[:k], tx_type[:k], tx_shares[:k], tx_value[:k], total_invested
+
+@njit(parallel=True, cache=True)
+def _threshold_grid_kernel(nav, lb_grid, lb_row, buy_arr, sell_arr, buy_amount):
+    """对一组 (回顾期, 买入阈值, 卖出阈值) 参数并行运行阈值策略，只返回汇总指标
+
+    lb_grid 每行是一个回顾期对应的回顾期收益率，lb_row[g] 指明第 g 组参数使用哪一行。
+    各组参数的状态机互不依赖，按 prange 分配到不同线程。
+    """
+    n = nav.shape[0]
+    n_params = buy_arr.shape[0]
+    out_final = np.zeros(n_params, dtype=np.float64)
+    out_invested = np.zeros(n_params, dtype=np.float64)
+    out_dd = np.zeros(n_params, dtype=np.float64)
+    for g in prange(n_params):
+        lb = lb_grid[lb_row[g]]
+        buy_thr = buy_arr[g]
+        sell_thr = sell_arr[g]
+        cash = np.float64(0.0)
+        shares = np.float64(0.0)
+        total_invested = np.float64(0.0)
+        peak = np.float64(0.0)
+        max_dd = np.float64(0.0)
+        value = np.float64(0.0)
+        for i in range(n):
+            price = nav[i]
+            r = lb[i]
+            if not np.isnan(r):
+                if r >= sell_thr and shares > 0:
+                    cash += shares * price
+                    shares = np.float64(0.0)
+                elif r <= buy_thr:
+                    if cash >= buy_amount:
+                        cash -= buy_amount
+                    else:
+                        total_invested += buy_amount - cash
+                        cash = np.float64(0.0)
+                    shares += buy_amount / price
+            # 与 calculate_max_drawdown 一致：以历史最高价值为基准，价值为 0 时不计回撤
+            value = cash + shares * price
+            if value > peak:
+                peak = value
+            elif peak > 0:
+                dd = (value - peak) / peak
+                if dd < max_dd:
+                    max_dd = dd
+        out_final[g] = value
+        out_invested[g] = total_invested
+        out_dd[g] = max_dd * 100
+    return out_final, out_invested, out_dd
+
+def compute_lookback_returns(nav, lookback_period):
+    """按行平移 lookback_period 个交易日计算回顾期收益率 (%)，前 lookback_period 行没有参考点记为 NaN"""
+    n = len(nav)
+    L = int(lookback_period)
+    lookback_return = np.full(n, np.nan, dtype=np.float64)
+    if L < n:
+        lookback_return[L:] = (nav[L:] / nav[:n - L] - 1.0) * 100.0
+    return lookback_return
+
+def _hash_fund_data(df):
+    """回测缓存用的轻量哈希：形状 + 首尾日期 + 净值列的向量化内容哈希，避免逐字节哈希整张表"""
+    return (
+        df.shape,
+        df.index[0].value if len(df) else None,
+        df.index[-1].value if len(df) else None,
+        int(pd.util.hash_pandas_object(df['单位净值'], index=False).sum()),
+    )
+
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs={pd.DataFrame: _hash_fund_data})
 def run_backtest(fund_data, dca_amount, threshold_buy_amount, buy_threshold, sell_threshold, lookback_period, dca_freq, dca_day):
     """运行回测并返回详细结果"""
     # ... [The existing run_backtest function remains unchanged] ...
@@ -216,81 +603,79 @@ def run_backtest(fund_data, dca_amount, threshold_buy_amount, buy_threshold, sel
         valid_data = data.dropna(subset=['单位净值'])
         if valid_data.empty: return pd.DatetimeIndex([])
         all_dates = valid_data.index
-        investment_dates = set()
         if freq == '每月':
-            for _, group in valid_data.groupby(pd.Grouper(freq='MS')):
-                month_start = group.index[0]
-                actual_day = min(day, month_start.days_in_month)
-                target_date = month_start.replace(day=actual_day)
-                potential_dates = all_dates[all_dates >= target_date]
-                if not potential_dates.empty:
-                    actual_date = potential_dates[0]
-                    if actual_date.month == target_date.month and actual_date.year == target_date.year:
-                        investment_dates.add(actual_date)
+            period_starts = pd.date_range(all_dates[0].normalize().replace(day=1), all_dates[-1], freq='MS')
+            targets = period_starts + pd.to_timedelta(np.minimum(day, period_starts.days_in_month) - 1, unit='D')
+            period_ends = period_starts + pd.offsets.MonthBegin(1)
         elif freq == '每周':
             weekday_map = {"周一": 0, "周二": 1, "周三": 2, "周四": 3, "周五": 4}
             target_weekday = weekday_map.get(day, 0)
-            for _, group in valid_data.groupby(pd.Grouper(freq='W-MON')):
-                potential_dates = group.index[group.index.weekday >= target_weekday]
-                if not potential_dates.empty:
-                    investment_dates.add(potential_dates[0])
-        return pd.DatetimeIndex(sorted(list(investment_dates)))
-
-    dca_investment_dates = get_dca_investment_dates(fund_data, dca_freq, dca_day)
-    dca_investments = pd.Series(0.0, index=fund_data.index)
-    if dca_amount > 0 and not dca_investment_dates.empty:
-        valid_dates = dca_investment_dates[dca_investment_dates.isin(fund_data.index)]
-        shares_bought = dca_amount / fund_data.loc[valid_dates, '单位净值']
-        dca_investments.loc[valid_dates] = shares_bought
-    
-    total_dca_invested = len(dca_investment_dates) * dca_amount
-    dca_cumulative_shares = dca_investments.cumsum()
-    dca_value = dca_cumulative_shares * fund_data['单位净值']
-
-    thr_cash = 0
-    thr_shares = 0
-    total_thr_invested = 0
-    thr_portfolio_value_list = []
-    thr_transactions = []
-    
-    fund_data['reference_nav'] = fund_data['单位净值'].shift(lookback_period)
-    fund_data['reference_date'] = fund_data['last_trading_date'].shift(lookback_period)
-    fund_data['lookback_return'] = (fund_data['单位净值'] / fund_data['reference_nav'] - 1) * 100
-
-    for date, row in fund_data.iterrows():
-        current_value = thr_cash + thr_shares * row['单位净值']
-        
-        if pd.notna(row['lookback_return']) and row['is_trading_day']:
-            if thr_shares > 0 and row['lookback_return'] >= sell_threshold:
-                sale_value = thr_shares * row['单位净值']
-                reason = f"回顾期收益率 {row['lookback_return']:.2f}% >= 卖出阈值 {sell_threshold}%"
-                reference_nav = row['reference_nav']
-                reference_date = row['reference_date']
-                thr_transactions.append({'date': date, 'type': '卖出', 'price': row['单位净值'], 'shares': thr_shares, 'value': sale_value, 'reason': reason, 'reference_nav': reference_nav, 'reference_date': reference_date})
-                thr_cash += sale_value
-                thr_shares = 0
-                current_value = thr_cash
-            elif row['lookback_return'] <= buy_threshold:
-                buy_amount = threshold_buy_amount
-                reason = f"回顾期收益率 {row['lookback_return']:.2f}% <= 买入阈值 {buy_threshold}%"
-                reference_nav = row['reference_nav']
-                reference_date = row['reference_date']
-                if thr_cash >= buy_amount:
-                    thr_cash -= buy_amount
-                    shares_to_buy = buy_amount / row['单位净值']
-                else:
-                    new_capital = buy_amount - thr_cash
-                    total_thr_invested += new_capital
-                    thr_cash = 0
-                    shares_to_buy = buy_amount / row['单位净值']
-                
-                thr_shares += shares_to_buy
-                thr_transactions.append({'date': date, 'type': '买入', 'price': row['单位净值'], 'shares': shares_to_buy, 'value': buy_amount, 'reason': reason, 'reference_nav': reference_nav, 'reference_date': reference_date})
-                current_value = thr_cash + thr_shares * row['单位净值']
-
-        thr_portfolio_value_list.append(current_value)
-
-    threshold_value = pd.Series(thr_portfolio_value_list, index=fund_data.index)
+            # 与 W-MON 分组保持一致：每组为 (上周一, 本周一]，即周二开始、周一结束
+            week_ends = pd.date_range(all_dates[0].normalize(), all_dates[-1] + pd.Timedelta(days=6), freq='W-MON')
+            targets = week_ends - pd.Timedelta(days=6) + pd.Timedelta(days=max(target_weekday, 1) - 1)
+            period_ends = week_ends + pd.Timedelta(days=1)
+        else:
+            return pd.DatetimeIndex([])
+
+        # 每个周期取目标日当天或之后的第一个交易日，且必须仍落在该周期内
+        idx = all_dates.searchsorted(targets, side='left')
+        in_range = idx < len(all_dates)
+        candidates = all_dates[idx[in_range]]
+        keep = candidates < period_ends[in_range]
+        if freq == '每周':
+            keep &= candidates.weekday >= target_weekday
+        return pd.DatetimeIndex(np.unique(candidates[keep].values))
+
+    nav = fund_data['单位净值'].to_numpy(dtype=np.float64)
+
+    if dca_amount <= 0:
+        # 不定投时直接给出全零的价值序列，跳过定投日期计算与份额累计
+        dca_investment_dates = pd.DatetimeIndex([])
+        total_dca_invested = 0
+        dca_value = pd.Series(0.0, index=fund_data.index)
+    else:
+        dca_investment_dates = get_dca_investment_dates(fund_data, dca_freq, dca_day)
+        # 只保留落在 fund_data 索引内的定投日，份额、总投入与买点标记使用同一组日期
+        #    索引已排序，二分查找得到行号后再核对日期是否完全一致
+        pos = fund_data.index.searchsorted(dca_investment_dates)
+        hit = pos < len(nav)
+        hit[hit] = fund_data.index[pos[hit]] == dca_investment_dates[hit]
+        dca_investment_dates = dca_investment_dates[hit]
+        pos = pos[hit]
+        dca_investments = np.zeros(len(nav))
+        dca_investments[pos] = dca_amount / nav[pos]
+
+        total_dca_invested = len(pos) * dca_amount
+        dca_cumulative_shares = np.cumsum(dca_investments)
+        dca_value = pd.Series(dca_cumulative_shares * nav, index=fund_data.index)
+
+    lookback_return = compute_lookback_returns(nav, lookback_period)
+
+    # 信号判断与持仓无关，先整体向量化求出买卖信号，状态机只需遍历信号日
+    valid = ~np.isnan(lookback_return)
+    buy_signal = valid & (lookback_return <= buy_threshold)
+    sell_signal = valid & (lookback_return >= sell_threshold)
+    event_idx = np.flatnonzero(buy_signal | sell_signal)
+
+    thr_portfolio_value, tx_idx, tx_type, tx_shares, tx_value, total_thr_invested = _threshold_strategy_kernel(
+        nav, event_idx, buy_signal, sell_signal, float(threshold_buy_amount)
+    )
+
+    # 内核只返回交易发生的行号与数值，这里按列一次性组装成带类型的交易记录表
+    # 交易日一定有回顾期收益率，参考点就是往前 lookback_period 行，只需按交易行号取值
+    reference_idx = tx_idx - int(lookback_period)
+    thr_transactions = pd.DataFrame({
+        'date': fund_data.index[tx_idx],
+        'type': pd.Categorical.from_codes(tx_type, categories=TX_TYPE_LABELS),
+        'price': nav[tx_idx],
+        'shares': tx_shares,
+        'value': tx_value,
+        'reason': _build_reasons(tx_type, lookback_return[tx_idx], buy_threshold, sell_threshold),
+        'reference_nav': nav[reference_idx],
+        'reference_date': fund_data.index[reference_idx],
+    })
+
+    threshold_value = pd.Series(thr_portfolio_value, index=fund_data.index)
 
     dca_max_drawdown = calculate_max_drawdown(dca_value)
     thr_max_drawdown = calculate_max_drawdown(threshold_value)
@@ -306,6 +691,54 @@ def run_backtest(fund_data, dca_amount, threshold_buy_amount, buy_threshold, sel
         "threshold": {"name": "阈值策略", "final_value": thr_final_value, "total_invested": total_thr_invested, "return_rate": thr_return_rate, "max_drawdown": thr_max_drawdown, "series": threshold_value, "transactions": thr_transactions}
     }
 
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _hash_fund_data})
+def run_parameter_sweep(fund_data, threshold_buy_amount, buy_thresholds, sell_thresholds, lookback_periods):
+    """对买入阈值 × 卖出阈值 × 回顾期的全部组合运行阈值策略，返回每组参数的汇总指标表"""
+    nav = fund_data['单位净值'].to_numpy(dtype=np.float64)
+    n = len(nav)
+
+    # 每个回顾期只算一次回顾期收益率 (float64)，与 run_backtest 共用同一计算，阈值判断结果一致
+    lookback_periods = [int(L) for L in lookback_periods]
+    lb_grid = np.empty((len(lookback_periods), n), dtype=np.float64)
+    for row, L in enumerate(lookback_periods):
+        lb_grid[row] = compute_lookback_returns(nav, L)
+
+    lb_row, buy_arr, sell_arr = (a.ravel() for a in np.meshgrid(
+        np.arange(len(lookback_periods)), np.asarray(buy_thresholds, dtype=np.float64),
+        np.asarray(sell_thresholds, dtype=np.float64), indexing='ij'))
+
+    final_value, total_invested, max_drawdown = _threshold_grid_kernel(
+        nav, lb_grid, lb_row.astype(np.int64), buy_arr, sell_arr, float(threshold_buy_amount)
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return_rate = np.where(total_invested > 0, (final_value / total_invested - 1) * 100, 0.0)
+
+    return pd.DataFrame({
+        'lookback_period': np.asarray(lookback_periods)[lb_row],
+        'buy_threshold': buy_arr,
+        'sell_threshold': sell_arr,
+        'final_value': final_value,
+        'total_invested': total_invested,
+        'return_rate': return_rate,
+        'max_drawdown': max_drawdown,
+    })
+
+def delete_checked_strategies(editor_key, fund_codes):
+    """策略表格的 on_change 回调：移除勾选了“删除”的策略并同步保存"""
+    edited_rows = st.session_state[editor_key]['edited_rows']
+    removed = [fund_codes[row] for row, change in edited_rows.items() if change.get('delete')]
+    if not removed:
+        return
+    for fund_code in removed:
+        st.session_state.strategies.pop(fund_code, None)
+    # 更换表格 key，重建后的表格不会保留按行号记录的旧勾选状态
+    st.session_state.strategy_table_version += 1
+    repo = get_github_repo()
+    if repo:
+        save_json_to_repo(repo, STRATEGIES_FILE, st.session_state.strategies, f"Remove strategy for {', '.join(removed)}")
+    else:
+        save_strategies_to_local(STRATEGIES_FILE, st.session_state.strategies)
+
 # --- UI Layout ---
 st.title("💼 基金策略分析与交易管理")
 
@@ -375,7 +808,8 @@ with tab1:
                 results = run_backtest(fund_data, dca_amount, threshold_buy_amount, buy_threshold, sell_threshold, lookback_period, dca_freq, dca_day)
                 # Store results and context for tab2
                 st.session_state.backtest_results = results
-                st.session_state.backtest_fund_data = fund_data.copy()
+                # get_fund_data 每次从缓存返回独立副本，且后续只读取不修改，直接保存引用即可
+                st.session_state.backtest_fund_data = fund_data
                 st.session_state.backtest_fund_code = fund_code
             st.subheader("📊 分析结果展示")
 
@@ -399,70 +833,105 @@ with tab1:
                 )
                 st.markdown(f"<small>净投入 <span title='策略从外部引入的总资金，不包含盈利再投的部分'>(?):</span> {thr_results['total_invested']:,.2f} 元 | **最大回撤**: <span style='color:red;'>{thr_results['max_drawdown']:.2f}%</span></small>", unsafe_allow_html=True)
 
-            fig_value = go.Figure()
-            fig_value.add_trace(go.Scatter(x=dca_results['series'].index, y=dca_results['series'].values, mode='lines', name=dca_results['name']))
-            fig_value.add_trace(go.Scatter(x=thr_results['series'].index, y=thr_results['series'].values, mode='lines', name=thr_results['name']))
-            fig_value.update_layout(title="投资组合价值走势对比", xaxis_title="日期", yaxis_title="价值 (元)", legend=dict(x=0.01, y=0.99))
-            st.plotly_chart(fig_value, use_container_width=True)
-
-            with st.expander("💡 指标计算逻辑说明"):
-                st.markdown("#### 核心指标如何计算？")
+            chart_tab_compare, chart_tab_detail = st.tabs(["策略对比", "阈值策略详细"])
+            with chart_tab_compare:
+                fig_value = go.Figure()
+                dca_x, dca_y = downsample_lttb(dca_results['series'].index.values, dca_results['series'].values)
+                thr_x, thr_y = downsample_lttb(thr_results['series'].index.values, thr_results['series'].values)
+                fig_value.add_trace(go.Scatter(x=dca_x, y=dca_y, mode='lines', name=dca_results['name']))
+                fig_value.add_trace(go.Scatter(x=thr_x, y=thr_y, mode='lines', name=thr_results['name']))
+                fig_value.update_layout(title="投资组合价值走势对比", xaxis_title="日期", yaxis_title="价值 (元)", legend=dict(x=0.01, y=0.99))
+                st.plotly_chart(fig_value, use_container_width=True)
+
+                with st.expander("💡 指标计算逻辑说明"):
+                    st.markdown("#### 核心指标如何计算？")
                 
-                st.markdown("""
-                **1. 最终总价值 (Final Value)**
-                - **定义**: 策略在回测结束日期的总资产价值。
-                - **计算**: `(期末持有份额 × 期末当日净值) + 期末持有现金`
-                - **示例 (阈值策略)**: 最终价值为 **{:.2f}** 元。
-                """.format(thr_results['final_value']))
-
-                st.markdown("""
-                **2. 总投入成本 (Total Invested)**
-                - **定投策略**: 简单地将每次的投资金额累加。
-                  - **计算**: `每次定投金额 × 定投总次数`
-                  - **示例**: `{} 元 × {} 次 = ` **{:.2f}** 元。
-                - **阈值策略**: 只计算策略从"外部"拿钱的总额 (净投入)，卖出盈利后的再投资不计入成本。
-                  - **计算**: 仅在策略持有的现金不足以支付当次买入时，从外部补充的资金才计入总投入。
-                  - **示例**: 本次策略净投入为 **{:.2f}** 元。
-                """.format(dca_amount, len(dca_results['investment_dates']), dca_results['total_invested'], thr_results['total_invested']))
-
-                st.markdown("""
-                **3. 总回报率 (Total Return Rate)**
-                - **定义**: 衡量策略盈利能力的核心指标。
-                - **计算**: `(最终总价值 / 总投入成本 - 1) * 100%`
-                - **示例 (阈值策略)**: `({:.2f} / {:.2f} - 1) * 100% = ` **{:.2f}%**
-                """.format(thr_results['final_value'], thr_results['total_invested'] if thr_results['total_invested'] > 0 else 1, thr_results['return_rate']))
-
-            st.subheader("阈值策略详细分析")
+                    st.markdown("""
+                    **1. 最终总价值 (Final Value)**
+                    - **定义**: 策略在回测结束日期的总资产价值。
+                    - **计算**: `(期末持有份额 × 期末当日净值) + 期末持有现金`
+                    - **示例 (阈值策略)**: 最终价值为 **{:.2f}** 元。
+                    """.format(thr_results['final_value']))
+
+                    st.markdown("""
+                    **2. 总投入成本 (Total Invested)**
+                    - **定投策略**: 简单地将每次的投资金额累加。
+                      - **计算**: `每次定投金额 × 定投总次数`
+                      - **示例**: `{} 元 × {} 次 = ` **{:.2f}** 元。
+                    - **阈值策略**: 只计算策略从"外部"拿钱的总额 (净投入)，卖出盈利后的再投资不计入成本。
+                      - **计算**: 仅在策略持有的现金不足以支付当次买入时，从外部补充的资金才计入总投入。
+                      - **示例**: 本次策略净投入为 **{:.2f}** 元。
+                    """.format(dca_amount, len(dca_results['investment_dates']), dca_results['total_invested'], thr_results['total_invested']))
+
+                    st.markdown("""
+                    **3. 总回报率 (Total Return Rate)**
+                    - **定义**: 衡量策略盈利能力的核心指标。
+                    - **计算**: `(最终总价值 / 总投入成本 - 1) * 100%`
+                    - **示例 (阈值策略)**: `({:.2f} / {:.2f} - 1) * 100% = ` **{:.2f}%**
+                    """.format(thr_results['final_value'], thr_results['total_invested'] if thr_results['total_invested'] > 0 else 1, thr_results['return_rate']))
+
+            with chart_tab_detail:
+                st.subheader("阈值策略详细分析")
             
-            fig_trades = make_subplots(specs=[[{"secondary_y": True}]])
+                fig_trades = make_subplots(specs=[[{"secondary_y": True}]])
             
-            fig_trades.add_trace(go.Scatter(x=thr_results['series'].index, y=thr_results['series'].values, mode='lines', name='策略价值'), secondary_y=False)
+                fig_trades.add_trace(go.Scatter(x=thr_x, y=thr_y, mode='lines', name='策略价值'), secondary_y=False)
             
-            fig_trades.add_trace(go.Scatter(x=fund_data.index, y=fund_data['单位净值'], mode='lines', name='基金净值', line=dict(color='gray', dash='dash')), secondary_y=True)
+                nav_x, nav_y = downsample_lttb(fund_data.index.values, fund_data['单位净值'].values)
+                fig_trades.add_trace(go.Scatter(x=nav_x, y=nav_y, mode='lines', name='基金净值', line=dict(color='gray', dash='dash')), secondary_y=True)
+
+                thr_transactions = thr_results['transactions']
+                if not thr_transactions.empty:
+                    # 交易记录中已带有成交净值，直接取用，无需回表查找
+                    is_buy = thr_transactions['type'] == '买入'
+                    buys = thr_transactions[is_buy]
+                    sells = thr_transactions[~is_buy]
+                    buy_dates = buys['date'].to_numpy()
+                    buy_prices = buys['price'].to_numpy()
+                    sell_dates = sells['date'].to_numpy()
+                    sell_prices = sells['price'].to_numpy()
+
+                    fig_trades.add_trace(go.Scatter(x=buy_dates, y=buy_prices, mode='markers', name='买入点', marker=dict(color='red', size=10, symbol='triangle-up')), secondary_y=True)
+                    fig_trades.add_trace(go.Scatter(x=sell_dates, y=sell_prices, mode='markers', name='卖出点', marker=dict(color='green', size=10, symbol='triangle-down')), secondary_y=True)
+
+                dca_investment_dates = results['dca']['investment_dates']
+                if not dca_investment_dates.empty:
+                    valid_dca_dates, dca_prices = lookup_nav(fund_data, dca_investment_dates)
+                    if not valid_dca_dates.empty:
+                        fig_trades.add_trace(go.Scatter(x=valid_dca_dates.to_numpy(), y=dca_prices, mode='markers', name='定投买入点', marker=dict(color='purple', size=8, symbol='diamond')), secondary_y=True)
+
+                fig_trades.update_layout(title="阈值策略详细分析：价值走势与买卖点", xaxis_title="日期", legend=dict(x=0.01, y=0.99))
+                fig_trades.update_yaxes(title_text="策略价值 (元)", secondary_y=False)
+                fig_trades.update_yaxes(title_text="基金单位净值", secondary_y=True)
+                st.plotly_chart(fig_trades, use_container_width=True)
+
+            with st.expander("参数扫描"):
+                st.caption(f"在当前回顾期 ({lookback_period} 天) 下，遍历买入/卖出阈值组合，比较阈值策略的最终价值。")
+                sweep_col1, sweep_col2, sweep_col3 = st.columns(3)
+                with sweep_col1:
+                    sweep_buy_range = st.slider("买入阈值范围 (%)", -50.0, -0.1, (-15.0, -1.0), 0.1)
+                with sweep_col2:
+                    sweep_sell_range = st.slider("卖出阈值范围 (%)", 0.1, 50.0, (1.0, 20.0), 0.1)
+                with sweep_col3:
+                    sweep_steps = st.number_input("每个阈值的取值个数", 2, 50, 15, 1)
+                if st.button("🔬 运行参数扫描", use_container_width=True):
+                    sweep_buy = np.round(np.linspace(*sweep_buy_range, int(sweep_steps)), 2)
+                    sweep_sell = np.round(np.linspace(*sweep_sell_range, int(sweep_steps)), 2)
+                    with st.spinner("正在进行参数扫描..."):
+                        sweep_df = run_parameter_sweep(fund_data, threshold_buy_amount, sweep_buy, sweep_sell, [lookback_period])
+                    heat = sweep_df.pivot(index='sell_threshold', columns='buy_threshold', values='final_value')
+                    heat_rr = sweep_df.pivot(index='sell_threshold', columns='buy_threshold', values='return_rate')
+                    fig_sweep = go.Figure(go.Heatmap(
+                        x=heat.columns, y=heat.index, z=heat.values, customdata=heat_rr.values,
+                        colorscale='RdYlGn', colorbar=dict(title="最终价值 (元)"),
+                        hovertemplate="买入阈值: %{x}%<br>卖出阈值: %{y}%<br>最终价值: %{z:,.2f} 元<br>总回报率: %{customdata:.2f}%<extra></extra>"
+                    ))
+                    fig_sweep.update_layout(title="阈值策略最终价值 (买入阈值 × 卖出阈值)", xaxis_title="买入阈值 (%)", yaxis_title="卖出阈值 (%)")
+                    st.plotly_chart(fig_sweep, use_container_width=True)
+                    best = sweep_df.loc[sweep_df['return_rate'].idxmax()]
+                    st.write(f"总回报率最高的组合: 买入阈值 **{best['buy_threshold']}%**，卖出阈值 **{best['sell_threshold']}%**，"
+                             f"总回报率 **{best['return_rate']:.2f}%**，最大回撤 **{best['max_drawdown']:.2f}%**。")
 
-            thr_transactions = thr_results['transactions']
-            if thr_transactions:
-                buy_dates = [t['date'] for t in thr_transactions if t['type'] == '买入']
-                buy_prices = [fund_data['单位净值'].loc[d] for d in buy_dates]
-                
-                sell_dates = [t['date'] for t in thr_transactions if t['type'] == '卖出']
-                sell_prices = [fund_data['单位净值'].loc[d] for d in sell_dates]
-
-                fig_trades.add_trace(go.Scatter(x=buy_dates, y=buy_prices, mode='markers', name='买入点', marker=dict(color='red', size=10, symbol='triangle-up')), secondary_y=True)
-                fig_trades.add_trace(go.Scatter(x=sell_dates, y=sell_prices, mode='markers', name='卖出点', marker=dict(color='green', size=10, symbol='triangle-down')), secondary_y=True)
-
-            dca_investment_dates = results['dca']['investment_dates']
-            if not dca_investment_dates.empty:
-                valid_dca_dates = dca_investment_dates[dca_investment_dates.isin(fund_data.index)]
-                if not valid_dca_dates.empty:
-                    dca_prices = fund_data['单位净值'].loc[valid_dca_dates]
-                    fig_trades.add_trace(go.Scatter(x=valid_dca_dates, y=dca_prices, mode='markers', name='定投买入点', marker=dict(color='purple', size=8, symbol='diamond')), secondary_y=True)
-
-            fig_trades.update_layout(title="阈值策略详细分析：价值走势与买卖点", xaxis_title="日期", legend=dict(x=0.01, y=0.99))
-            fig_trades.update_yaxes(title_text="策略价值 (元)", secondary_y=False)
-            fig_trades.update_yaxes(title_text="基金单位净值", secondary_y=True)
-            st.plotly_chart(fig_trades, use_container_width=True)
-            
             # --- Add to Monitor Button ---
             st.info("如果觉得当前参数下的阈值策略表现良好，可以一键将其加入后台监控。")
             if st.button("📈 将此策略加入后台监控 (自动同步到 GitHub)", key=f"add_strat_{fund_code}", use_container_width=True):
@@ -479,11 +948,12 @@ with tab1:
                 else:
                     save_strategies_to_local(STRATEGIES_FILE, st.session_state.strategies)
 
-            if thr_transactions:
+            if not thr_transactions.empty:
                 st.write("**交易记录:**")
-                trans_df = pd.DataFrame(thr_transactions)
-                trans_df['date'] = trans_df['date'].dt.strftime('%Y-%m-%d')
-                trans_df['reference_date'] = trans_df['reference_date'].dt.strftime('%Y-%m-%d')
+                trans_df = thr_transactions.copy()
+                # 用 NumPy 按天截断后转字符串，避免逐行调用 strftime
+                trans_df['date'] = trans_df['date'].to_numpy().astype('datetime64[D]').astype(str)
+                trans_df['reference_date'] = trans_df['reference_date'].to_numpy().astype('datetime64[D]').astype(str)
                 trans_df = trans_df.rename(columns={
                     'date': '日期', 'type': '类型', 'price': '成交净值', 
                     'shares': '份额', 'value': '成交金额(元)', 'reason': '触发说明',
@@ -503,10 +973,9 @@ with tab1:
             with st.spinner("正在计算操作建议..."):
                 try:
                     today = datetime.now().date()
-                    # 获取所有历史数据，并按日期排序
-                    hist_data_raw = ak.fund_open_fund_info_em(fund_code, indicator="单位净值走势")
-                    hist_data_raw['净值日期'] = pd.to_datetime(hist_data_raw['净值日期']).dt.date
-                    past_data = hist_data_raw[hist_data_raw['净值日期'] < today].sort_values(by='净值日期', ascending=True)
+                    # 获取所有历史数据 (已按日期升序)，直接与 datetime64 列比较，无需逐行转换为 date
+                    hist_data_raw = fetch_raw_nav(fund_code)
+                    past_data = hist_data_raw[hist_data_raw['净值日期'] < pd.Timestamp(today)]
 
                     if len(past_data) < lookback_period:
                         st.error(f"历史数据不足 {lookback_period} 个交易日，无法计算建议。")
@@ -584,134 +1053,156 @@ with tab1:
                     st.warning("请输入买入金额或卖出份额。")
 
                 if trans_type:
-                    new_transaction = pd.DataFrame([{
-                        'date': pd.to_datetime(datetime.now().date()),
+                    st.session_state.transaction_rows.append({
+                        'date': pd.Timestamp(datetime.now().date()),
                         'fund_code': fund_code,
                         'type': trans_type,
                         'price': estimated_nav_input,
                         'shares': trans_shares,
                         'value': trans_value,
                         'reason': reason
-                    }])
-                    st.session_state.transactions = pd.concat([st.session_state.transactions, new_transaction], ignore_index=True)
-                    save_transactions_to_file(st.session_state.transactions)
+                    })
+                    save_transactions_to_file(transactions_to_frame(st.session_state.transaction_rows))
                     st.success(f"✅ {trans_type} 交易记录成功！请切换到“我的交易记录”标签页查看。")
                     st.balloons()
 
-with tab2:
-    st.header("📈 我的交易记录与持仓分析")
-    # 直接从 Session State 读取数据，确保实时性
-    my_trans_df = st.session_state.transactions
-
-    if my_trans_df.empty:
-        st.info("您还没有任何交易记录。请在“策略回测分析”标签页的“今日操作建议”部分录入您的第一笔交易。")
-    else:
-        st.subheader("所有交易记录")
-        st.dataframe(my_trans_df.sort_values('date', ascending=False).style.format({
-            'price': '{:.4f}', 'shares': '{:,.2f}', 'value': '{:,.2f}'
-        }), use_container_width=True)
-
-        st.subheader("持仓分析")
-        fund_codes_in_log = my_trans_df['fund_code'].unique()
-        selected_fund_code = st.selectbox("选择要分析的基金", fund_codes_in_log)
+# --- Holdings Panel ---
+@st.fragment
+def holdings_panel(trans_by_fund):
+    """持仓分析与择时复盘图，作为片段运行：切换基金时只重跑本面板，不会重跑整个页面 (含回测)"""
+    fund_codes_in_log = list(trans_by_fund)
+    selected_fund_code = st.selectbox("选择要分析的基金", fund_codes_in_log)
 
-        if selected_fund_code:
-            selected_fund_trans = my_trans_df[my_trans_df['fund_code'] == selected_fund_code].copy()
-            # Normalize transaction dates to midnight to match historical data index
-            selected_fund_trans['date'] = pd.to_datetime(selected_fund_trans['date']).dt.normalize()
+    if selected_fund_code:
+        selected_fund_trans = trans_by_fund[selected_fund_code].copy()
+        # Normalize transaction dates to midnight to match historical data index
+        selected_fund_trans['date'] = selected_fund_trans['date'].dt.normalize()
 
-            try:
-                latest_nav_data = ak.fund_open_fund_info_em(selected_fund_code, indicator="单位净值走势").iloc[-1]
-                latest_nav = pd.to_numeric(latest_nav_data['单位净值'])
-                latest_nav_date = pd.to_datetime(latest_nav_data['净值日期']).strftime('%Y-%m-%d')
+        try:
+            latest_nav_data = fetch_raw_nav(selected_fund_code).iloc[-1]
+            latest_nav = latest_nav_data['单位净值']
+            latest_nav_date = latest_nav_data['净值日期'].strftime('%Y-%m-%d')
                 
-                buy_shares = selected_fund_trans[selected_fund_trans['type'] == '买入']['shares'].sum()
-                sell_shares = selected_fund_trans[selected_fund_trans['type'] == '卖出']['shares'].sum()
-                total_shares = buy_shares - sell_shares
-
-                buy_cost = selected_fund_trans[selected_fund_trans['type'] == '买入']['value'].sum()
-                sell_value = selected_fund_trans[selected_fund_trans['type'] == '卖出']['value'].sum()
+            # 买卖掩码只计算一次，份额与金额直接在数组上求和
+            is_my_buy = (selected_fund_trans['type'] == '买入').to_numpy()
+            is_my_sell = (selected_fund_trans['type'] == '卖出').to_numpy()
+            trans_shares = selected_fund_trans['shares'].to_numpy(dtype=np.float64)
+            trans_values = selected_fund_trans['value'].to_numpy(dtype=np.float64)
+
+            buy_shares = trans_shares[is_my_buy].sum()
+            sell_shares = trans_shares[is_my_sell].sum()
+            total_shares = buy_shares - sell_shares
+
+            buy_cost = trans_values[is_my_buy].sum()
+            sell_value = trans_values[is_my_sell].sum()
                 
-                current_market_value = total_shares * latest_nav
-                total_profit = current_market_value + sell_value - buy_cost
-                return_rate = (total_profit / buy_cost) * 100 if buy_cost > 0 else 0
+            current_market_value = total_shares * latest_nav
+            total_profit = current_market_value + sell_value - buy_cost
+            return_rate = (total_profit / buy_cost) * 100 if buy_cost > 0 else 0
 
-                st.markdown(f"**{get_fund_name(selected_fund_code)} ({selected_fund_code})** 的持仓详情 (最新净值: {latest_nav:.4f} @ {latest_nav_date})")
+            st.markdown(f"**{get_fund_name(selected_fund_code)} ({selected_fund_code})** 的持仓详情 (最新净值: {latest_nav:.4f} @ {latest_nav_date})")
                 
-                col1, col2, col3 = st.columns(3)
-                col1.metric("当前总持仓份额", f"{total_shares:,.2f}")
-                col2.metric("持仓总市值 (元)", f"{current_market_value:,.2f}")
-                col3.metric("累计投入成本 (元)", f"{buy_cost:,.2f}")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("当前总持仓份额", f"{total_shares:,.2f}")
+            col2.metric("持仓总市值 (元)", f"{current_market_value:,.2f}")
+            col3.metric("累计投入成本 (元)", f"{buy_cost:,.2f}")
 
-                col4, col5 = st.columns(2)
-                col4.metric("累计收益 (元)", f"{total_profit:,.2f}", delta=f"{total_profit:,.2f} 元")
-                col5.metric("累计回报率 (%)", f"{return_rate:.2f}%", delta=f"{return_rate:.2f}%")
+            col4, col5 = st.columns(2)
+            col4.metric("累计收益 (元)", f"{total_profit:,.2f}", delta=f"{total_profit:,.2f} 元")
+            col5.metric("累计回报率 (%)", f"{return_rate:.2f}%", delta=f"{return_rate:.2f}%")
 
-                st.subheader("交易择时复盘：实际操作 vs. 策略信号")
+            st.subheader("交易择时复盘：实际操作 vs. 策略信号")
                 
-                # --- Smartly load fund data for chart ---
-                # Priority 1: Use data from backtest if fund code matches
-                if (st.session_state.backtest_fund_code == selected_fund_code and 
-                    st.session_state.backtest_fund_data is not None):
-                    hist_data = st.session_state.backtest_fund_data.copy()
-                    st.info("图表背景已加载前序回测数据，以供精确对比。")
-                # Priority 2: Fetch data based on personal transaction history
-                else:
-                    min_date = selected_fund_trans['date'].min().date()
-                    hist_data = get_fund_data(selected_fund_code, min_date, datetime.now().date())
+            # --- Smartly load fund data for chart ---
+            # Priority 1: Use data from backtest if fund code matches
+            if (st.session_state.backtest_fund_code == selected_fund_code and 
+                st.session_state.backtest_fund_data is not None):
+                hist_data = st.session_state.backtest_fund_data
+                st.info("图表背景已加载前序回测数据，以供精确对比。")
+            # Priority 2: Fetch data based on personal transaction history
+            else:
+                min_date = selected_fund_trans['date'].min().date()
+                hist_data = get_fund_data(selected_fund_code, min_date, datetime.now().date())
                 
-                if hist_data is not None:
-                    # --- Create Figure ---
-                    fig = go.Figure()
+            if hist_data is not None:
+                # --- Create Figure ---
+                fig = go.Figure()
                     
-                    # Plot 1: Fund NAV (Main Curve)
-                    fig.add_trace(go.Scatter(x=hist_data.index, y=hist_data['单位净值'], mode='lines', name='基金净值', line=dict(color='cornflowerblue', width=2)))
+                # Plot 1: Fund NAV (Main Curve)
+                hist_x, hist_y = downsample_lttb(hist_data.index.values, hist_data['单位净值'].values)
+                fig.add_trace(go.Scatter(x=hist_x, y=hist_y, mode='lines', name='基金净值', line=dict(color='cornflowerblue', width=2)))
                     
-                    # Plot 2: User's Real Buy/Sell Points (on NAV Curve)
-                    my_buy_points = selected_fund_trans[selected_fund_trans['type'] == '买入']
-                    my_sell_points = selected_fund_trans[selected_fund_trans['type'] == '卖出']
+                # Plot 2: User's Real Buy/Sell Points (on NAV Curve)
+                # 直接用买卖掩码切日期数组，不再构造中间 DataFrame
+                trans_dates = selected_fund_trans['date'].to_numpy()
                     
-                    valid_my_buys = my_buy_points[my_buy_points['date'].isin(hist_data.index)]
-                    if not valid_my_buys.empty:
-                        fig.add_trace(go.Scatter(x=valid_my_buys['date'], y=hist_data.loc[valid_my_buys['date'], '单位净值'], mode='markers', name='我的买入点', marker=dict(color='red', size=10, symbol='triangle-up')))
-
-                    valid_my_sells = my_sell_points[my_sell_points['date'].isin(hist_data.index)]
-                    if not valid_my_sells.empty:
-                        fig.add_trace(go.Scatter(x=valid_my_sells['date'], y=hist_data.loc[valid_my_sells['date'], '单位净值'], mode='markers', name='我的卖出点', marker=dict(color='green', size=10, symbol='triangle-down')))
-
-                    # Plot 3: Backtest Strategy Signal Points (on NAV Curve)
-                    if st.session_state.backtest_results:
-                        # Check if the backtest fund code matches the currently analyzed fund
-                        if st.session_state.backtest_fund_code == selected_fund_code:
-                            thr_transactions = st.session_state.backtest_results['threshold']['transactions']
-                            if thr_transactions:
-                                strat_buy_dates = [t['date'] for t in thr_transactions if t['type'] == '买入']
-                                strat_sell_dates = [t['date'] for t in thr_transactions if t['type'] == '卖出']
-
-                                valid_strat_buys = [d for d in strat_buy_dates if d in hist_data.index]
-                                if valid_strat_buys:
-                                    fig.add_trace(go.Scatter(x=valid_strat_buys, y=hist_data.loc[valid_strat_buys, '单位净值'], mode='markers', name='策略建议买点', marker=dict(color='red', size=9, symbol='diamond-open')))
+                # 所有标记点的净值都通过 lookup_nav 一次性按位置批量取出
+                valid_my_buys, my_buy_navs = lookup_nav(hist_data, trans_dates[is_my_buy])
+                if not valid_my_buys.empty:
+                    fig.add_trace(go.Scatter(x=valid_my_buys.to_numpy(), y=my_buy_navs, mode='markers', name='我的买入点', marker=dict(color='red', size=10, symbol='triangle-up')))
+
+                valid_my_sells, my_sell_navs = lookup_nav(hist_data, trans_dates[is_my_sell])
+                if not valid_my_sells.empty:
+                    fig.add_trace(go.Scatter(x=valid_my_sells.to_numpy(), y=my_sell_navs, mode='markers', name='我的卖出点', marker=dict(color='green', size=10, symbol='triangle-down')))
+
+                # Plot 3: Backtest Strategy Signal Points (on NAV Curve)
+                if st.session_state.backtest_results:
+                    # Check if the backtest fund code matches the currently analyzed fund
+                    if st.session_state.backtest_fund_code == selected_fund_code:
+                        thr_transactions = st.session_state.backtest_results['threshold']['transactions']
+                        if not thr_transactions.empty:
+                            is_strat_buy = (thr_transactions['type'] == '买入').to_numpy()
+                            strat_buy_dates = thr_transactions['date'].to_numpy()[is_strat_buy]
+                            strat_sell_dates = thr_transactions['date'].to_numpy()[~is_strat_buy]
+
+                            valid_strat_buys, strat_buy_navs = lookup_nav(hist_data, strat_buy_dates)
+                            if not valid_strat_buys.empty:
+                                fig.add_trace(go.Scatter(x=valid_strat_buys.to_numpy(), y=strat_buy_navs, mode='markers', name='策略建议买点', marker=dict(color='red', size=9, symbol='diamond-open')))
                                 
-                                valid_strat_sells = [d for d in strat_sell_dates if d in hist_data.index]
-                                if valid_strat_sells:
-                                    fig.add_trace(go.Scatter(x=valid_strat_sells, y=hist_data.loc[valid_strat_sells, '单位净值'], mode='markers', name='策略建议卖点', marker=dict(color='green', size=9, symbol='diamond-open')))
-                        else:
-                            st.warning("当前分析的基金与回测的基金不一致，无法显示策略建议点。")
-
-
-                    # --- Finalize Layout ---
-                    fig.update_layout(
-                        title=f"交易择时复盘：实际操作 vs. 策略信号 ({selected_fund_code})",
-                        xaxis_title="日期",
-                        yaxis_title="基金单位净值 (元)",
-                        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.warning("无法获取用于绘制图表的基金历史数据。")
+                            valid_strat_sells, strat_sell_navs = lookup_nav(hist_data, strat_sell_dates)
+                            if not valid_strat_sells.empty:
+                                fig.add_trace(go.Scatter(x=valid_strat_sells.to_numpy(), y=strat_sell_navs, mode='markers', name='策略建议卖点', marker=dict(color='green', size=9, symbol='diamond-open')))
+                    else:
+                        st.warning("当前分析的基金与回测的基金不一致，无法显示策略建议点。")
+
+
+                # --- Finalize Layout ---
+                fig.update_layout(
+                    title=f"交易择时复盘：实际操作 vs. 策略信号 ({selected_fund_code})",
+                    xaxis_title="日期",
+                    yaxis_title="基金单位净值 (元)",
+                    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.warning("无法获取用于绘制图表的基金历史数据。")
+
+        except Exception as e:
+            st.error(f"分析个人持仓时出错: {e}")
+
+
+with tab2:
+    st.header("📈 我的交易记录与持仓分析")
+    # 直接从 Session State 读取数据，确保实时性；本次运行只构造一次 DataFrame
+    my_trans_df = transactions_to_frame(st.session_state.transaction_rows)
 
-            except Exception as e:
-                st.error(f"分析个人持仓时出错: {e}")
+    if my_trans_df.empty:
+        st.info("您还没有任何交易记录。请在“策略回测分析”标签页的“今日操作建议”部分录入您的第一笔交易。")
+    else:
+        st.subheader("所有交易记录")
+        # 预先格式化为字符串列，避免 Styler 逐单元格渲染
+        trans_display = my_trans_df.sort_values('date', ascending=False)
+        trans_display = trans_display.assign(
+            price=trans_display['price'].map('{:.4f}'.format),
+            shares=trans_display['shares'].map('{:,.2f}'.format),
+            value=trans_display['value'].map('{:,.2f}'.format),
+        )
+        st.dataframe(trans_display, use_container_width=True)
+
+        st.subheader("持仓分析")
+        # 按基金代码一次分组，后续直接按代码取出对应交易，不再逐次布尔筛选整张表
+        trans_by_fund = dict(tuple(my_trans_df.groupby('fund_code', sort=False, observed=True)))
+        holdings_panel(trans_by_fund)
 
 with tab3:
     st.header("⚙️ 云端部署与监控")
@@ -732,17 +1223,15 @@ with tab3:
         current_strategies = st.session_state.strategies
         if current_strategies:
             with st.spinner("正在获取所有监控中基金的最新估值和建议..."):
-                results = []
-                for fund_code, params in current_strategies.items():
-                    advice_result = get_strategy_advice(fund_code, params)
-                    results.append(advice_result)
-                    time.sleep(1) # Be polite to API
-                st.session_state.dashboard_results = results
+                # 各基金的请求相互独立，并发获取 (线程数有限，避免请求过于频繁)
+                st.session_state.dashboard_results = fetch_strategy_advice_batch(current_strategies)
+                st.session_state.dashboard_updated_at = datetime.now()
         else:
             st.session_state.dashboard_results = []
             st.warning("您还没有添加任何监控策略，无法获取实时数据。")
 
     if st.session_state.dashboard_results:
+        st.caption(f"数据获取于 {st.session_state.dashboard_updated_at:%H:%M:%S}，60 秒内重复刷新将使用缓存结果")
         st.write("---")
         for advice_result in st.session_state.dashboard_results:
             if advice_result['status'] == '成功':
@@ -758,7 +1247,8 @@ with tab3:
                     st.markdown(f"**操作建议: <font color='{advice_result['advice_color']}'>{advice_result['advice']}!</font>**", unsafe_allow_html=True)
 
                 with st.expander(f"查看 {advice_result['code']} 计算详情"):
-                    details = advice_result['details']
+                    # 缓存的建议由所有会话共用，只格式化副本，不修改原对象
+                    details = dict(advice_result['details'])
                     if isinstance(details.get('reference_date'), date):
                         details['reference_date'] = details['reference_date'].strftime('%Y-%m-%d')
                     st.json(details)
@@ -771,24 +1261,27 @@ with tab3:
     if not st.session_state.strategies:
         st.warning("目前没有正在监控的策略。请在“策略回测分析”页面添加。")
     else:
-        for fund_code, params in list(st.session_state.strategies.items()):
-            fund_name = get_fund_name(fund_code)
-            col1, col2, col3, col4, col5 = st.columns([2, 2, 2, 2, 1])
-            with col1:
-                st.markdown(f"**{fund_name}** (`{fund_code}`)")
-            with col2:
-                st.metric("买入阈值", f"{params['buy_threshold']}%")
-            with col3:
-                st.metric("卖出阈值", f"{params['sell_threshold']}%")
-            with col4:
-                st.metric("回顾期", f"{params['lookback_period']} 天")
-            with col5:
-                if st.button("🗑️", key=f"del_{fund_code}", help="删除此监控策略并同步到 GitHub"):
-                    del st.session_state.strategies[fund_code]
-                    repo = get_github_repo()
-                    if repo:
-                        save_json_to_repo(repo, STRATEGIES_FILE, st.session_state.strategies, f"Remove strategy for {fund_code}")
-                    else:
-                        save_strategies_to_local(STRATEGIES_FILE, st.session_state.strategies)
-                    st.rerun()
-            st.divider()
\ No newline at end of file
+        # 所有策略放进一个表格组件渲染，避免每条策略各自创建一组 columns/metric/button
+        if 'strategy_table_version' not in st.session_state:
+            st.session_state.strategy_table_version = 0
+        strategy_table = pd.DataFrame.from_dict(st.session_state.strategies, orient='index').reindex(
+            columns=['buy_threshold', 'sell_threshold', 'lookback_period'])
+        strategy_table.insert(0, 'name', [get_fund_name(code) for code in strategy_table.index])
+        strategy_table['delete'] = False
+        editor_key = f"strategy_table_{st.session_state.strategy_table_version}"
+        st.data_editor(
+            strategy_table,
+            key=editor_key,
+            on_change=delete_checked_strategies,
+            args=(editor_key, list(strategy_table.index)),
+            disabled=['name', 'buy_threshold', 'sell_threshold', 'lookback_period'],
+            column_config={
+                '_index': st.column_config.TextColumn("基金代码"),
+                'name': st.column_config.TextColumn("基金名称"),
+                'buy_threshold': st.column_config.NumberColumn("买入阈值", format="%.1f%%"),
+                'sell_threshold': st.column_config.NumberColumn("卖出阈值", format="%.1f%%"),
+                'lookback_period': st.column_config.NumberColumn("回顾期", format="%d 天"),
+                'delete': st.column_config.CheckboxColumn("🗑️ 删除", help="勾选后删除此监控策略并同步到 GitHub"),
+            },
+            use_container_width=True,
+        )
\ No newline at end of file
@@ -5,6 +5,12 @@
 import requests
 import json
 
+try:
+    # orjson 解析更快，且解析错误同样是 json.JSONDecodeError 的子类；未安装时使用标准库
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 def debug_fund_api():
     """调试基金API"""
     
@@ -14,13 +20,17 @@ def debug_fund_api():
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
     
+    # 所有基金代码共用一个 Session，复用同一个 TCP 连接
+    session = requests.Session()
+    session.headers.update(headers)
+    
     for fund_code in fund_codes:
         print(f"\n🔍 调试基金代码: {fund_code}")
         print("=" * 40)
         
         try:
             url = f"http://fundgz.1234567.com.cn/js/{fund_code}.js"
-            response = requests.get(url, headers=headers, timeout=10)
+            response = session.get(url, timeout=10)
             
             print(f"状态码: {response.status_code}")
             print(f"响应长度: {len(response.text)}")
@@ -37,7 +47,7 @@ def debug_fund_api():
                     print(f"提取的JSON: {json_str}")
                     
                     try:
-                        data = json.loads(json_str)
+                        data = json_loads(json_str)
                         print(f"✅ 解析成功: {data}")
                     except json.JSONDecodeError as e:
                         print(f"❌ JSON解析失败: {e}")
@@ -45,6 +55,8 @@ def debug_fund_api():
                 
         except Exception as e:
             print(f"请求失败: {e}")
+    
+    session.close()
 
 if __name__ == "__main__":
     debug_fund_api()
\ No newline at end of file
@@ -4,6 +4,8 @@
 
 from fund_backtest import FundDataDownloader, FundBacktester, FundAnalyzer
 import matplotlib.pyplot as plt
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 def demo_fund_analysis():
     """演示基金分析功能"""
@@ -90,23 +92,17 @@ def demo_fund_analysis():
         
         # 6. 额外的风险分析
         print("\n6️⃣ 风险分析...")
-        returns = fund_data['nav'].pct_change().dropna()
+        # 净值序列连续无缺失，直接在数组上差分得到日收益率
+        nav = fund_data['nav'].to_numpy(dtype=np.float64)
+        returns = np.diff(nav) / nav[:-1]
         
-        # VaR分析
-        var_95 = returns.quantile(0.05) * 100
-        var_99 = returns.quantile(0.01) * 100
+        # VaR分析: 两个分位数一次求出 (np.quantile 基于 partition 选择，与 pandas 相同的线性插值)
+        var_99, var_95 = np.quantile(returns, [0.01, 0.05]) * 100
         
-        # 连续亏损分析
+        # 连续亏损分析: 首尾补 0 后差分，得到每段连续亏损的起止位置
         negative_returns = returns < 0
-        max_consecutive_losses = 0
-        current_losses = 0
-        
-        for is_loss in negative_returns:
-            if is_loss:
-                current_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, current_losses)
-            else:
-                current_losses = 0
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], negative_returns.astype(np.int8), [0]))))
+        max_consecutive_losses = int((edges[1::2] - edges[::2]).max()) if edges.size else 0
         
         print(f"   📉 VaR (95%置信度): {var_95:.2f}%")
         print(f"   📉 VaR (99%置信度): {var_99:.2f}%")
@@ -141,10 +137,17 @@ def demo_multiple_funds():
     downloader = FundDataDownloader()
     results = {}
     
+    # 各基金的下载互不依赖，先并发获取，回测计算再按顺序进行
+    with ThreadPoolExecutor(max_workers=len(fund_portfolio)) as executor:
+        downloads = {
+            fund_code: executor.submit(downloader.get_fund_history, fund_code, "2023-01-01", "2024-01-01")
+            for fund_code in fund_portfolio
+        }
+    
     for fund_code, fund_name in fund_portfolio.items():
         try:
             print(f"\n正在分析 {fund_name} ({fund_code})...")
-            fund_data = downloader.get_fund_history(fund_code, "2023-01-01", "2024-01-01")
+            fund_data = downloads[fund_code].result()
             
             if not fund_data.empty:
                 backtester = FundBacktester(fund_data)
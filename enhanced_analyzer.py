@@ -2,14 +2,35 @@
 增强版基金分析器 - 支持阈值策略可视化
 """
 
+import functools
+
 from fund_backtest import FundAnalyzer
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import pandas as pd
+import numpy as np
+
+def _simplified_paths(plot_func):
+    """绘图期间合并长时间序列中肉眼无法区分的线段，减少重绘的顶点数 (只在该方法内生效，不修改全局 rcParams)"""
+    @functools.wraps(plot_func)
+    def wrapper(*args, **kwargs):
+        with plt.rc_context({'path.simplify_threshold': 1.0}):
+            return plot_func(*args, **kwargs)
+    return wrapper
+
+# 买卖点统一的标记样式 (单一颜色，所有子图共用)
+BUY_MARKER_KW = dict(color='green', marker='^', zorder=5)
+SELL_MARKER_KW = dict(color='red', marker='v', zorder=5)
+
+def _format_date_axis(ax):
+    """日期横轴统一显示为 年-月 并旋转 45 度 (旋转设置在坐标轴上，缩放后新刻度同样生效)"""
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    ax.tick_params(axis='x', labelrotation=45)
 
 class EnhancedFundAnalyzer(FundAnalyzer):
     """增强版基金分析器"""
     
+    @_simplified_paths
     def plot_threshold_strategy_analysis(self, simulation_data: pd.DataFrame, 
                                        strategy_name: str = "阈值策略",
                                        buy_threshold: float = None,
@@ -19,38 +40,47 @@ class EnhancedFundAnalyzer(FundAnalyzer):
         fig, axes = plt.subplots(2, 3, figsize=(18, 12))
         fig.suptitle(f'基金 {self.fund_code} - {strategy_name}详细分析', fontsize=16, fontweight='bold')
         
+        # 各子图反复用到的列一次性取成 NumPy 数组，买卖点用同一组掩码从数组中切出
+        dates = simulation_data['date'].to_numpy()
+        portfolio_value = simulation_data['portfolio_value'].to_numpy()
+        cash = simulation_data['cash'].to_numpy()
+        shares = simulation_data['shares'].to_numpy()
+        lookback_return = (simulation_data['lookback_return'].to_numpy()
+                           if 'lookback_return' in simulation_data.columns else None)
+        actions = simulation_data['action'].to_numpy()
+        is_buy = actions == 'buy'
+        is_sell = actions == 'sell'
+        buy_count = int(is_buy.sum())
+        sell_count = int(is_sell.sum())
+        
         # 1. 投资组合价值走势 + 买卖点
         ax1 = axes[0, 0]
-        ax1.plot(simulation_data['date'], simulation_data['portfolio_value'], 
-                linewidth=2, color='blue', label='组合价值')
+        ax1.plot(dates, portfolio_value, 
+                linewidth=2, color='blue', label='组合价值', rasterized=True)
         
         # 标记买卖点
-        buy_points = simulation_data[simulation_data['action'] == 'buy']
-        sell_points = simulation_data[simulation_data['action'] == 'sell']
-        
-        if not buy_points.empty:
-            ax1.scatter(buy_points['date'], buy_points['portfolio_value'], 
-                       color='green', marker='^', s=60, label=f'买入点({len(buy_points)}次)', zorder=5)
-        if not sell_points.empty:
-            ax1.scatter(sell_points['date'], sell_points['portfolio_value'], 
-                       color='red', marker='v', s=60, label=f'卖出点({len(sell_points)}次)', zorder=5)
+        if buy_count:
+            ax1.scatter(dates[is_buy], portfolio_value[is_buy], 
+                       **BUY_MARKER_KW, s=60, label=f'买入点({buy_count}次)')
+        if sell_count:
+            ax1.scatter(dates[is_sell], portfolio_value[is_sell], 
+                       **SELL_MARKER_KW, s=60, label=f'卖出点({sell_count}次)')
         
         ax1.set_title('投资组合价值 & 交易点', fontweight='bold')
         ax1.set_xlabel('日期')
         ax1.set_ylabel('价值 (元)')
         ax1.grid(True, alpha=0.3)
         ax1.legend()
-        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
+        _format_date_axis(ax1)
         
         # 2. 现金与持仓变化
         ax2 = axes[0, 1]
         ax2_twin = ax2.twinx()
         
-        line1 = ax2.plot(simulation_data['date'], simulation_data['cash'], 
-                        color='green', linewidth=2, label='现金余额')
-        line2 = ax2_twin.plot(simulation_data['date'], simulation_data['shares'], 
-                            color='orange', linewidth=2, label='持有份额')
+        line1 = ax2.plot(dates, cash, 
+                        color='green', linewidth=2, label='现金余额', rasterized=True)
+        line2 = ax2_twin.plot(dates, shares, 
+                            color='orange', linewidth=2, label='持有份额', rasterized=True)
         
         ax2.set_title('现金与持仓变化', fontweight='bold')
         ax2.set_xlabel('日期')
@@ -62,14 +92,13 @@ class EnhancedFundAnalyzer(FundAnalyzer):
         lines = line1 + line2
         labels = [l.get_label() for l in lines]
         ax2.legend(lines, labels, loc='upper left')
-        ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
+        _format_date_axis(ax2)
         
         # 3. 回顾期收益率 + 阈值线
         ax3 = axes[0, 2]
-        if 'lookback_return' in simulation_data.columns:
-            ax3.plot(simulation_data['date'], simulation_data['lookback_return'], 
-                    linewidth=1, color='gray', alpha=0.7, label='回顾期收益率')
+        if lookback_return is not None:
+            ax3.plot(dates, lookback_return, 
+                    linewidth=1, color='gray', alpha=0.7, label='回顾期收益率', rasterized=True)
             
             # 绘制阈值线
             if buy_threshold is not None:
@@ -80,81 +109,70 @@ class EnhancedFundAnalyzer(FundAnalyzer):
                            label=f'卖出阈值 (+{sell_threshold}%)', alpha=0.8)
             
             # 标记实际买卖点的收益率
-            if not buy_points.empty:
-                buy_returns = buy_points['lookback_return']
-                ax3.scatter(buy_points['date'], buy_returns, 
-                           color='green', marker='^', s=40, alpha=0.8, zorder=5)
-            if not sell_points.empty:
-                sell_returns = sell_points['lookback_return']
-                ax3.scatter(sell_points['date'], sell_returns, 
-                           color='red', marker='v', s=40, alpha=0.8, zorder=5)
+            if buy_count:
+                ax3.scatter(dates[is_buy], lookback_return[is_buy], 
+                           **BUY_MARKER_KW, s=40, alpha=0.8)
+            if sell_count:
+                ax3.scatter(dates[is_sell], lookback_return[is_sell], 
+                           **SELL_MARKER_KW, s=40, alpha=0.8)
         
         ax3.set_title(f'回顾期收益率 ({lookback_period}天)', fontweight='bold')
         ax3.set_xlabel('日期')
         ax3.set_ylabel('收益率 (%)')
         ax3.grid(True, alpha=0.3)
         ax3.legend()
-        ax3.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45)
+        _format_date_axis(ax3)
         
         # 4. 基金净值走势
         ax4 = axes[1, 0]
-        ax4.plot(self.data['date'], self.data['nav'], linewidth=2, color='blue', label='基金净值')
+        ax4.plot(self.data['date'], self.data['nav'], linewidth=2, color='blue', label='基金净值', rasterized=True)
         
         # 在净值图上也标记买卖点
-        if not buy_points.empty:
-            buy_navs = []
-            for date in buy_points['date']:
-                nav = self.data[self.data['date'] == date]['nav']
-                if not nav.empty:
-                    buy_navs.append((date, nav.iloc[0]))
-            if buy_navs:
-                buy_dates, buy_nav_values = zip(*buy_navs)
-                ax4.scatter(buy_dates, buy_nav_values, 
-                           color='green', marker='^', s=50, alpha=0.8, zorder=5)
-        
-        if not sell_points.empty:
-            sell_navs = []
-            for date in sell_points['date']:
-                nav = self.data[self.data['date'] == date]['nav']
-                if not nav.empty:
-                    sell_navs.append((date, nav.iloc[0]))
-            if sell_navs:
-                sell_dates, sell_nav_values = zip(*sell_navs)
-                ax4.scatter(sell_dates, sell_nav_values, 
-                           color='red', marker='v', s=50, alpha=0.8, zorder=5)
+        # 按日期建立一次净值索引 (同一日期取第一条)，买卖点的净值批量查找，不再逐日扫描全表
+        nav_by_date = self.data.drop_duplicates('date').set_index('date')['nav']
+        if buy_count:
+            buy_navs = nav_by_date.reindex(dates[is_buy]).dropna()
+            if not buy_navs.empty:
+                ax4.scatter(buy_navs.index, buy_navs.to_numpy(), 
+                           **BUY_MARKER_KW, s=50, alpha=0.8)
+        
+        if sell_count:
+            sell_navs = nav_by_date.reindex(dates[is_sell]).dropna()
+            if not sell_navs.empty:
+                ax4.scatter(sell_navs.index, sell_navs.to_numpy(), 
+                           **SELL_MARKER_KW, s=50, alpha=0.8)
         
         ax4.set_title('基金净值走势 & 交易点', fontweight='bold')
         ax4.set_xlabel('日期')
         ax4.set_ylabel('净值')
         ax4.grid(True, alpha=0.3)
         ax4.legend()
-        ax4.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
+        _format_date_axis(ax4)
         
         # 5. 交易信号分布
         ax5 = axes[1, 1]
         if 'signal' in simulation_data.columns:
-            signals = simulation_data['signal']
-            signal_counts = signals.value_counts()
+            # 信号只取 -1/0/1，平移到 0..2 后用 bincount 一次计数
+            signals = simulation_data['signal'].to_numpy(dtype=np.int64)
+            sell_signals, hold_days, buy_signals = np.bincount(signals + 1, minlength=3)[:3]
             
             labels = []
             values = []
             colors = []
             
-            if 1 in signal_counts:
-                labels.append(f'买入信号 ({signal_counts[1]}次)')
-                values.append(signal_counts[1])
+            if buy_signals:
+                labels.append(f'买入信号 ({buy_signals}次)')
+                values.append(buy_signals)
                 colors.append('green')
             
-            if -1 in signal_counts:
-                labels.append(f'卖出信号 ({signal_counts[-1]}次)')
-                values.append(signal_counts[-1])
+            if sell_signals:
+                labels.append(f'卖出信号 ({sell_signals}次)')
+                values.append(sell_signals)
                 colors.append('red')
             
-            if 0 in signal_counts:
-                labels.append(f'持有 ({signal_counts[0]}天)')
-                values.append(signal_counts[0])
+            if hold_days:
+                labels.append(f'持有 ({hold_days}天)')
+                values.append(hold_days)
                 colors.append('gray')
             
             if values:
@@ -174,23 +192,23 @@ class EnhancedFundAnalyzer(FundAnalyzer):
         stats_text += f"回顾期: {lookback_period}天\n\n"
         
         stats_text += f"交易统计:\n"
-        stats_text += f"买入次数: {len(buy_points)}\n"
-        stats_text += f"卖出次数: {len(sell_points)}\n"
+        stats_text += f"买入次数: {buy_count}\n"
+        stats_text += f"卖出次数: {sell_count}\n"
         
-        if not buy_points.empty:
-            avg_buy_return = buy_points['lookback_return'].mean()
+        if buy_count and lookback_return is not None:
+            avg_buy_return = np.nanmean(lookback_return[is_buy])
             stats_text += f"平均买入时收益率: {avg_buy_return:.2f}%\n"
         
-        if not sell_points.empty:
-            avg_sell_return = sell_points['lookback_return'].mean()
+        if sell_count and lookback_return is not None:
+            avg_sell_return = np.nanmean(lookback_return[is_sell])
             stats_text += f"平均卖出时收益率: {avg_sell_return:.2f}%\n"
         
         stats_text += f"\n最终状态:\n"
-        stats_text += f"现金余额: {simulation_data['cash'].iloc[-1]:.2f}元\n"
-        stats_text += f"持有份额: {simulation_data['shares'].iloc[-1]:.2f}\n"
+        stats_text += f"现金余额: {cash[-1]:.2f}元\n"
+        stats_text += f"持有份额: {shares[-1]:.2f}\n"
         
-        initial_value = simulation_data['portfolio_value'].iloc[0]
-        final_value = simulation_data['portfolio_value'].iloc[-1]
+        initial_value = portfolio_value[0]
+        final_value = portfolio_value[-1]
         total_return = (final_value / initial_value - 1) * 100
         stats_text += f"总收益率: {total_return:.2f}%\n"
         
@@ -207,6 +225,7 @@ class EnhancedFundAnalyzer(FundAnalyzer):
         plt.tight_layout()
         plt.show()
     
+    @_simplified_paths
     def compare_strategies(self, strategy_results: dict):
         """对比多种策略的结果"""
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
@@ -217,15 +236,14 @@ class EnhancedFundAnalyzer(FundAnalyzer):
         for strategy_name, result in strategy_results.items():
             data = result['data']
             ax1.plot(data['date'], data['portfolio_value'], 
-                    linewidth=2, label=strategy_name, alpha=0.8)
+                    linewidth=2, label=strategy_name, alpha=0.8, rasterized=True)
         
         ax1.set_title('投资组合价值对比', fontweight='bold')
         ax1.set_xlabel('日期')
         ax1.set_ylabel('价值 (元)')
         ax1.grid(True, alpha=0.3)
         ax1.legend()
-        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45)
+        _format_date_axis(ax1)
         
         # 2. 收益率对比
         ax2 = axes[0, 1]
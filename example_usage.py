@@ -3,9 +3,14 @@
 演示如何使用各个模块进行基金分析
 """
 
+import matplotlib
+matplotlib.use('Agg')  # 示例只输出文字结果，不弹出图形窗口，批量运行时无需 GUI 后端
+
 from fund_backtest import FundDataDownloader, FundBacktester, FundAnalyzer
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 def example_single_fund_analysis():
     """单个基金分析示例"""
@@ -62,11 +67,15 @@ def example_multiple_funds_comparison():
     
     downloader = FundDataDownloader()
     
+    # 获取数据: 各基金的下载互不依赖，先并发获取，回测再按顺序进行
+    with ThreadPoolExecutor(max_workers=len(fund_codes)) as executor:
+        downloads = [executor.submit(downloader.get_fund_history, fund_code, "2023-01-01", "2024-01-01")
+                     for fund_code in fund_codes]
+    
     for i, fund_code in enumerate(fund_codes):
         print(f"\n分析基金 {i+1}: {fund_code} ({fund_names[i]})")
         
-        # 获取数据
-        fund_data = downloader.get_fund_history(fund_code, "2023-01-01", "2024-01-01")
+        fund_data = downloads[i].result()
         
         if not fund_data.empty:
             # 回测分析
@@ -81,7 +90,8 @@ def example_multiple_funds_comparison():
         print("=" * 80)
         
         # 创建对比表格
-        comparison_df = pd.DataFrame(results).T
+        # 每只基金一行直接构造，无需先按列构造再转置
+        comparison_df = pd.DataFrame.from_dict(results, orient='index')
         print(comparison_df.to_string())
         
         # 找出最佳基金
@@ -105,22 +115,13 @@ def example_custom_analysis():
         # VaR (Value at Risk) - 95%置信度
         var_95 = returns.quantile(0.05) * 100
         
-        # 连续上涨/下跌天数
-        returns_sign = (returns > 0).astype(int)
-        consecutive_wins = 0
-        consecutive_losses = 0
-        current_win_streak = 0
-        current_loss_streak = 0
-        
-        for ret in returns_sign:
-            if ret == 1:
-                current_win_streak += 1
-                current_loss_streak = 0
-                consecutive_wins = max(consecutive_wins, current_win_streak)
-            else:
-                current_loss_streak += 1
-                current_win_streak = 0
-                consecutive_losses = max(consecutive_losses, current_loss_streak)
+        # 连续上涨/下跌天数: 首尾补 -1 后差分找出每段的起点，相邻起点之差即各段长度
+        returns_sign = (returns > 0).to_numpy().astype(np.int8)
+        run_starts = np.flatnonzero(np.diff(np.concatenate(([-1], returns_sign, [-1]))))
+        run_lengths = np.diff(run_starts)
+        run_values = returns_sign[run_starts[:-1]]
+        consecutive_wins = int(run_lengths[run_values == 1].max(initial=0))
+        consecutive_losses = int(run_lengths[run_values == 0].max(initial=0))
         
         return {
             'VaR_95%': round(var_95, 2),
@@ -153,19 +154,20 @@ def example_risk_analysis():
     fund_data = downloader.get_fund_history(fund_code, "2022-01-01")
     
     if not fund_data.empty:
-        returns = fund_data['nav'].pct_change().dropna()
+        returns = fund_data['nav'].pct_change().dropna().to_numpy()
         
-        # 不同置信度的VaR
-        var_90 = returns.quantile(0.10) * 100
-        var_95 = returns.quantile(0.05) * 100
-        var_99 = returns.quantile(0.01) * 100
+        # 不同置信度的VaR: 三个分位数一次求出
+        q01, q05, q10 = np.quantile(returns, [0.01, 0.05, 0.10])
+        var_90 = q10 * 100
+        var_95 = q05 * 100
+        var_99 = q01 * 100
         
-        # 条件VaR (CVaR)
-        cvar_95 = returns[returns <= returns.quantile(0.05)].mean() * 100
+        # 条件VaR (CVaR)，直接复用上面的 5% 分位数
+        cvar_95 = returns[returns <= q05].mean() * 100
         
         # 下行风险
         downside_returns = returns[returns < 0]
-        downside_deviation = downside_returns.std() * (252**0.5) * 100
+        downside_deviation = downside_returns.std(ddof=1) * (252**0.5) * 100
         
         print("风险分析结果:")
         print("-" * 30)
@@ -3,6 +3,7 @@
 功能：基金数据下载、回测分析、图形趋势分析
 """
 
+import os
 import requests
 import pandas as pd
 import numpy as np
@@ -23,17 +24,22 @@ plt.rcParams['axes.unicode_minus'] = False
 class FundDataDownloader:
     """基金数据下载器"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = '~/.fund_cache'):
         self.base_url = "http://fund.eastmoney.com/f10/F10DataApi.aspx"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        # 复用同一个 Session，分页请求和多线程下载可以共用 TCP 连接
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # 历史净值的本地 Parquet 缓存目录，传入 None 则不使用缓存
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
     
     def get_fund_info(self, fund_code: str) -> Dict[str, Any]:
         """获取基金基本信息"""
         try:
             url = f"http://fundgz.1234567.com.cn/js/{fund_code}.js"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             
             if response.status_code == 200:
                 # 解析返回的JavaScript格式数据
@@ -65,6 +71,11 @@ class FundDataDownloader:
             if end_date is None:
                 end_date = datetime.now().strftime('%Y-%m-%d')
             
+            # 当天已下载过相同区间的数据时直接读取本地缓存
+            cached = self._load_history_cache(fund_code, start_date, end_date)
+            if cached is not None:
+                return cached
+            
             # 构建请求URL
             url = f"http://fund.eastmoney.com/f10/F10DataApi.aspx"
             params = {
@@ -81,7 +92,7 @@ class FundDataDownloader:
             
             while True:
                 params['page'] = page
-                response = requests.get(url, params=params, headers=self.headers, timeout=10)
+                response = self.session.get(url, params=params, timeout=10)
                 
                 if response.status_code != 200:
                     break
@@ -138,6 +149,7 @@ class FundDataDownloader:
             if all_data:
                 df = pd.DataFrame(all_data)
                 df = df.sort_values('date').reset_index(drop=True)
+                self._save_history_cache(fund_code, start_date, end_date, df)
                 return df
             else:
                 # 如果无法获取历史数据，生成模拟数据
@@ -148,6 +160,37 @@ class FundDataDownloader:
             print(f"获取历史数据失败: {e}")
             return self._generate_mock_data(fund_code, start_date, end_date)
     
+    def _history_cache_path(self, fund_code: str, start_date: str, end_date: str) -> Optional[str]:
+        """历史净值缓存文件路径，未启用缓存时返回 None"""
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{fund_code}_{start_date}_{end_date}.parquet")
+    
+    def _load_history_cache(self, fund_code: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        """读取当天写入的历史净值缓存，没有可用缓存时返回 None"""
+        path = self._history_cache_path(fund_code, start_date, end_date)
+        if not path or not os.path.exists(path):
+            return None
+        if datetime.fromtimestamp(os.path.getmtime(path)).date() != datetime.now().date():
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception:
+            return None  # 缓存文件损坏时重新下载
+    
+    def _save_history_cache(self, fund_code: str, start_date: str, end_date: str, df: pd.DataFrame):
+        """写入历史净值缓存 (只缓存真实下载的数据)，写入失败不影响本次返回的数据"""
+        path = self._history_cache_path(fund_code, start_date, end_date)
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = path + '.tmp'
+            df.to_parquet(tmp_path, index=False, compression='zstd')
+            os.replace(tmp_path, path)
+        except Exception:
+            pass
+    
     def _generate_mock_data(self, fund_code: str, start_date: str, end_date: str) -> pd.DataFrame:
         """生成模拟基金数据"""
         start = pd.to_datetime(start_date)
@@ -157,10 +200,11 @@ class FundDataDownloader:
         dates = pd.bdate_range(start=start, end=end)
         
         # 生成模拟净值数据
-        np.random.seed(hash(fund_code) % 2**32)  # 基于基金代码设置随机种子
+        # 基于基金代码设置随机种子，使用独立的随机数生成器，多线程同时生成时互不干扰
+        rng = np.random.RandomState(hash(fund_code) % 2**32)
         
-        initial_nav = 1.0 + np.random.uniform(0, 2)  # 初始净值
-        returns = np.random.normal(0.0005, 0.02, len(dates))  # 日收益率
+        initial_nav = 1.0 + rng.uniform(0, 2)  # 初始净值
+        returns = rng.normal(0.0005, 0.02, len(dates))  # 日收益率
         
         navs = [initial_nav]
         for ret in returns[1:]:
@@ -189,25 +233,27 @@ class FundBacktester:
         
     def calculate_metrics(self) -> Dict[str, Any]:
         """计算回测指标"""
-        returns = self.data['returns'].dropna()
+        # 各项指标都在 NumPy 数组上计算，避免逐个 pandas 操作的额外开销
+        returns = self.data['returns'].dropna().to_numpy(dtype=np.float64)
+        nav = self.data['nav'].to_numpy(dtype=np.float64)
         
         # 基本统计指标
-        total_return = (self.data['nav'].iloc[-1] / self.data['nav'].iloc[0] - 1) * 100
+        total_return = (nav[-1] / nav[0] - 1) * 100
         annual_return = ((1 + total_return/100) ** (252 / len(returns)) - 1) * 100
-        volatility = returns.std() * np.sqrt(252) * 100
+        volatility = returns.std(ddof=1) * np.sqrt(252) * 100
         
         # 夏普比率（假设无风险利率为3%）
         risk_free_rate = 0.03
         sharpe_ratio = (annual_return/100 - risk_free_rate) / (volatility/100) if volatility > 0 else 0
         
         # 最大回撤
-        cumulative = (1 + returns).cumprod()
-        rolling_max = cumulative.expanding().max()
+        cumulative = np.cumprod(1 + returns)
+        rolling_max = np.maximum.accumulate(cumulative)
         drawdown = (cumulative - rolling_max) / rolling_max
         max_drawdown = drawdown.min() * 100
         
         # 胜率
-        win_rate = (returns > 0).sum() / len(returns) * 100
+        win_rate = np.count_nonzero(returns > 0) / len(returns) * 100
         
         return {
             '总收益率(%)': round(total_return, 2),
@@ -247,21 +293,15 @@ class FundBacktester:
         elif investment_strategy == 'dca':
             # 定投策略（每月定投）
             monthly_investment = initial_amount / 12  # 假设分12个月定投
-            result_data['shares'] = 0.0
-            result_data['portfolio_value'] = 0.0
-            result_data['cash'] = 0.0
-            result_data['action'] = 'hold'
+            nav = result_data['nav'].to_numpy(dtype=np.float64)
+            # 每20个交易日（约一个月）定投一次，份额按买入日累加
+            is_buy = np.arange(len(nav)) % 20 == 0
+            total_shares = np.cumsum(np.where(is_buy, monthly_investment / nav, 0.0))
             
-            total_shares = 0
-            for i in range(len(result_data)):
-                # 每20个交易日（约一个月）定投一次
-                if i % 20 == 0:
-                    shares_bought = monthly_investment / result_data['nav'].iloc[i]
-                    total_shares += shares_bought
-                    result_data.loc[i, 'action'] = 'buy'
-                
-                result_data.loc[i, 'shares'] = total_shares
-                result_data.loc[i, 'portfolio_value'] = total_shares * result_data['nav'].iloc[i]
+            result_data['shares'] = total_shares
+            result_data['portfolio_value'] = total_shares * nav
+            result_data['cash'] = 0.0
+            result_data['action'] = np.where(is_buy, 'buy', 'hold')
                 
         elif investment_strategy == 'threshold':
             # 阈值策略
@@ -1,4 +1,7 @@
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
 import pandas as pd
 import akshare as ak
@@ -87,4 +90,50 @@ def get_strategy_advice(fund_code: str, params: dict) -> dict:
             'reference_date': reference_date,
             'lookback_period': lookback_period
         }
-    }
\ No newline at end of file
+    }
+
+
+class _RateLimiter:
+    """
+    Leaky-bucket gate shared by all worker threads: callers are let through at
+    most once every `min_interval` seconds. A caller reserves its slot under the
+    lock and sleeps outside it, so waiting threads never block each other.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next_start, now)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+# One limiter for the whole process (~1 request/s), so repeated dashboard
+# refreshes and the monitor loop together stay as polite as the old serial loop.
+_advice_rate_limiter = _RateLimiter(min_interval=1.0)
+
+
+def get_strategy_advice_batch(strategies: dict, max_workers: int = 4) -> list:
+    """
+    Calculates the advice for every monitored fund concurrently.
+    Each fund costs two network round-trips, so a small thread pool overlaps them
+    while keeping the number of simultaneous requests to the APIs modest.
+    Every fund first passes the process-wide rate limiter, so funds start at
+    most about once per second, even across concurrent batches.
+    Results are returned in the same order as `strategies`.
+    """
+    if not strategies:
+        return []
+
+    def advise(item):
+        _advice_rate_limiter.acquire()
+        return get_strategy_advice(*item)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(strategies))) as executor:
+        return list(executor.map(advise, strategies.items()))
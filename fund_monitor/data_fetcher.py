@@ -4,6 +4,16 @@ import time
 import json
 from typing import Dict, Optional
 
+try:
+    # orjson is an optional, faster parser; its errors subclass json.JSONDecodeError.
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Reuse one HTTP session so repeated (and concurrent) quote requests share
+# keep-alive connections instead of opening a new socket for every fund.
+_session = requests.Session()
+
 
 def get_fund_data(fund_code: str) -> Optional[Dict]:
     """
@@ -36,7 +46,7 @@ def get_fund_data(fund_code: str) -> Optional[Dict]:
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _session.get(url, headers=headers, timeout=10)
         response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
 
         # The response is a JSONP format like "jsonpgz( {...} );"
@@ -47,7 +57,7 @@ def get_fund_data(fund_code: str) -> Optional[Dict]:
             return None
             
         json_content = json_str[len('jsonpgz('):-2]
-        data = json.loads(json_content)
+        data = json_loads(json_content)
         return data
 
     except requests.exceptions.RequestException as e:
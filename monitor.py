@@ -12,7 +12,7 @@ g_decision_report_sent_date = date.min # Tracks if the daily decision report has
 g_trade_days_cache = {'date': None, 'days': set()} # Cache for trade days
 
 # --- Core Modules ---
-from fund_monitor.core import get_strategy_advice
+from fund_monitor.core import get_strategy_advice_batch
 from fund_monitor.notifier import send_email_notification
 
 # --- Helper Functions ---
@@ -95,11 +95,8 @@ def send_decision_report(user_config):
         g_decision_report_sent_date = today # Mark as "sent" to avoid re-checking
         return
 
-    report_items = []
-    for fund_code, params in strategies.items():
-        advice_result = get_strategy_advice(fund_code, params)
-        report_items.append(advice_result)
-        time.sleep(1) # Be polite to API
+    # Funds are independent, so fetch them concurrently with a small worker pool
+    report_items = get_strategy_advice_batch(strategies)
 
     # Build HTML content
     html_rows = ""
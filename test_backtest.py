@@ -0,0 +1,125 @@
+"""
+回测内核回归测试：numba 内核 vs 逐日 pandas 参考实现，参数扫描 vs 单次回测
+"""
+
+import ast
+import os
+
+import numpy as np
+import pandas as pd
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# 回顾期 2 天：第 2 天 0.97/1.00 与第 6 天 1.05/1.00 的收益率恰好落在阈值上
+# (float64 为 -3.0000000000000027% 与 5.000000000000004%，float32 下会变成 -2.9999971% 与 4.999995%，买卖信号翻转)
+BOUNDARY_HEAD = [1.0000, 1.0000, 0.9700, 1.0000, 1.0000, 1.0000, 1.0500]
+BUY_THRESHOLD = -3.0
+SELL_THRESHOLD = 5.0
+LOOKBACK_PERIOD = 2
+BUY_AMOUNT = 1000.0
+
+
+def load_app_functions(path=APP_PATH):
+    """app.py 是 Streamlit 页面脚本，直接导入会渲染整个页面；这里只执行其中的导入、常量与函数定义"""
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    def is_definition(node):
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.Try, ast.FunctionDef, ast.ClassDef)):
+            return True
+        return isinstance(node, ast.Assign) and all(
+            isinstance(t, ast.Name) and t.id.lstrip('_').isupper() for t in node.targets)
+
+    definitions = ast.Module(body=[node for node in tree.body if is_definition(node)], type_ignores=[])
+    # 与 streamlit run 一样以 __main__ 作为模块名：numba 磁盘缓存 (cache=True) 记录模块名，测试与页面可共用同一份缓存
+    namespace = {'__name__': '__main__', '__file__': path}
+    exec(compile(definitions, path, 'exec'), namespace)
+    return namespace
+
+
+def make_fund_data(seed=7, n_tail=250):
+    """固定的净值序列：开头是阈值边界用例，之后接一段 4 位小数的随机游走"""
+    rng = np.random.default_rng(seed)
+    tail = BOUNDARY_HEAD[-1] * np.cumprod(1 + rng.normal(0, 0.015, n_tail))
+    nav = np.concatenate([BOUNDARY_HEAD, np.round(tail, 4)])
+    dates = pd.bdate_range('2023-01-02', periods=len(nav))
+    return pd.DataFrame({'单位净值': nav}, index=dates)
+
+
+def reference_threshold_backtest(nav: pd.Series, buy_threshold, sell_threshold, lookback_period, buy_amount):
+    """逐日遍历的阈值策略，与 app.py 中的规则相同：先判断卖出，现金不足时由外部补足并计入投入"""
+    lookback_return = (nav / nav.shift(lookback_period) - 1) * 100
+    cash = shares = total_invested = 0.0
+    transactions = []
+    for day, price, r in zip(nav.index, nav, lookback_return):
+        if pd.isna(r):
+            continue
+        if r >= sell_threshold and shares > 0:
+            transactions.append((day, '卖出', shares, shares * price))
+            cash += shares * price
+            shares = 0.0
+        elif r <= buy_threshold:
+            if cash >= buy_amount:
+                cash -= buy_amount
+            else:
+                total_invested += buy_amount - cash
+                cash = 0.0
+            shares += buy_amount / price
+            transactions.append((day, '买入', buy_amount / price, buy_amount))
+    final_value = cash + shares * nav.iloc[-1]
+    return pd.DataFrame(transactions, columns=['date', 'type', 'shares', 'value']), final_value, total_invested
+
+
+def test_kernel_matches_reference(app=None):
+    """阈值策略内核的交易记录与最终价值应与参考实现一致，且每笔成交的份额 × 成交价与成交金额可以对账"""
+    app = app or load_app_functions()
+    fund_data = make_fund_data()
+    results = app['run_backtest'](fund_data, 0, BUY_AMOUNT, BUY_THRESHOLD, SELL_THRESHOLD, LOOKBACK_PERIOD, '每月', 1)
+    threshold = results['threshold']
+    transactions = threshold['transactions']
+
+    expected_tx, expected_final, expected_invested = reference_threshold_backtest(
+        fund_data['单位净值'], BUY_THRESHOLD, SELL_THRESHOLD, LOOKBACK_PERIOD, BUY_AMOUNT)
+
+    assert list(transactions['date']) == list(expected_tx['date'])
+    assert list(transactions['type'].astype(str)) == list(expected_tx['type'])
+    assert np.allclose(transactions['shares'], expected_tx['shares'], rtol=1e-12)
+    assert np.allclose(transactions['value'], expected_tx['value'], rtol=1e-12)
+    assert np.isclose(threshold['final_value'], expected_final, rtol=1e-12)
+    assert np.isclose(threshold['total_invested'], expected_invested)
+    assert np.allclose(transactions['shares'] * transactions['price'], transactions['value'], rtol=1e-12)
+
+    # 边界用例：恰好等于阈值的收益率必须触发交易
+    first_two = transactions.iloc[:2]
+    assert list(first_two['date']) == [fund_data.index[2], fund_data.index[6]]
+    assert list(first_two['type'].astype(str)) == ['买入', '卖出']
+    assert first_two['reason'].iloc[0] == f"回顾期收益率 -3.00% <= 买入阈值 {BUY_THRESHOLD}%"
+    print(f"✅ 内核与参考实现一致：{len(transactions)} 笔交易，最终价值 {threshold['final_value']:.2f}")
+
+
+def test_parameter_sweep_matches_backtest(app=None):
+    """参数扫描每组参数的汇总指标应与 run_backtest 的阈值策略结果一致"""
+    app = app or load_app_functions()
+    fund_data = make_fund_data()
+    sweep = app['run_parameter_sweep'](fund_data, BUY_AMOUNT, [BUY_THRESHOLD, -5.0], [SELL_THRESHOLD, 8.0], [LOOKBACK_PERIOD, 5])
+    assert len(sweep) == 8
+
+    for row in sweep.itertuples():
+        threshold = app['run_backtest'](fund_data, 0, BUY_AMOUNT, row.buy_threshold, row.sell_threshold,
+                                        row.lookback_period, '每月', 1)['threshold']
+        assert np.isclose(row.final_value, threshold['final_value'])
+        assert np.isclose(row.total_invested, threshold['total_invested'])
+        assert np.isclose(row.return_rate, threshold['return_rate'])
+        assert np.isclose(row.max_drawdown, threshold['max_drawdown'])
+    print(f"✅ 参数扫描与单次回测一致：{len(sweep)} 组参数")
+
+
+def main():
+    print("--- 回测内核回归测试 ---")
+    app = load_app_functions()
+    test_kernel_matches_reference(app)
+    test_parameter_sweep_matches_backtest(app)
+
+
+if __name__ == "__main__":
+    main()